@@ -1,45 +1,117 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
 from typing import Any, cast
 
-from homeassistant.core import HomeAssistant, ServiceCall
+import voluptuous as vol
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 
-from .binary_sensor import _create_binary_sensor_entities
 from .const import (
     CONF_ALARM_ID,
     CONF_ALARMS,
+    CONF_CURSOR,
+    CONF_END,
     CONF_EVENT,
-    CONF_LABEL,
+    CONF_EVENT_KEY,
+    CONF_EVENTS,
+    CONF_FINGERPRINT,
+    CONF_LIMIT,
     CONF_MOBILE_APP_DEVICE_ID,
+    CONF_OCCURRED_AT,
     CONF_PHONE_ID,
     CONF_PHONE_NAME,
+    CONF_START,
+    DATA_COORDINATORS,
+    DATA_HISTORY,
+    DEFAULT_QUERY_LIMIT,
+    DEFAULT_SCHEDULE_LIMIT,
     DOMAIN,
     EVENT_ALARM_EVENT,
-    EVENT_BEDTIME_STARTS,
-    EVENT_WAKING_UP,
-    EVENT_WIND_DOWN_STARTS,
+    HISTORY_DB_FILE,
+    HISTORY_MAX_EVENTS,
+    HISTORY_PRUNE_SLACK,
+    MAX_QUERY_LIMIT,
+    MAX_SCHEDULE_LIMIT,
     PLATFORMS,
+    SIGNAL_ALARM_ADDED,
+    SIGNAL_EVENT_SENSOR_ADDED,
 )
 from .coordinator import (
+    PHONE_SYNC_FIELDS,
     IPhoneAlarmsSyncConfigEntry,
     IPhoneAlarmsSyncCoordinator,
     IPhoneAlarmsSyncData,
+    PhoneData,
+    SyncResult,
 )
-from .number import _create_number_entities
-from .sensor import (
-    _create_alarm_sensor_entities,
-    _create_phone_event_sensor_entities,
-)
-from .utils import extract_alarm_uuid
+from .events import ALARM_EVENT_KINDS, DEVICE_EVENT_KINDS
+from .history import EventHistory
+from .qr_code import ShortcutQRCodeView
+from .storage import async_migrate_runtime_to_store, create_store
+from .utils import compute_alarms_fingerprint, extract_alarm_uuid, format_timestamp
 
 _LOGGER = logging.getLogger(__name__)
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
+QUERY_EVENTS_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_PHONE_ID): cv.string,
+        vol.Optional(CONF_ALARM_ID): cv.string,
+        vol.Optional(CONF_START): cv.datetime,
+        vol.Optional(CONF_END): cv.datetime,
+        vol.Optional(CONF_LIMIT, default=DEFAULT_QUERY_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_QUERY_LIMIT)
+        ),
+        vol.Optional(CONF_CURSOR): vol.Match(r"^[0-9.e+-]+:[0-9]+$"),
+    }
+)
+
+GET_SCHEDULE_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_PHONE_ID): cv.string,
+        vol.Optional(CONF_LIMIT, default=DEFAULT_SCHEDULE_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_SCHEDULE_LIMIT)
+        ),
+    }
+)
+
+REPORT_EVENTS_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_PHONE_ID): cv.string,
+        vol.Required(CONF_EVENTS): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {
+                        vol.Optional(CONF_ALARM_ID): cv.string,
+                        vol.Required(CONF_EVENT): cv.string,
+                        vol.Optional(CONF_OCCURRED_AT): cv.datetime,
+                        vol.Optional(CONF_EVENT_KEY): cv.string,
+                    }
+                )
+            ],
+        ),
+    }
+)
+
 
 def _get_via_device_from_device_id(
     device_registry: dr.DeviceRegistry, device_id: str | None
@@ -53,172 +125,292 @@ def _get_via_device_from_device_id(
     return cast(tuple[str, ...], identifier)
 
 
-async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
-    hass.data.setdefault(DOMAIN, {})
-
-    async def handle_sync_alarms(call: ServiceCall) -> None:
-        phone_id = call.data[CONF_PHONE_ID]
-        alarms = call.data[CONF_ALARMS]
+@callback
+def _async_reconcile_phone_device(
+    hass: HomeAssistant, coordinator: IPhoneAlarmsSyncCoordinator
+) -> None:
+    phone = coordinator.get_phone()
+    if phone is None:
+        return
+    device_registry = dr.async_get(hass)
+    if (
+        coordinator.phone_device_id is not None
+        and coordinator.phone_device_via_id == phone.mobile_app_device_id
+        and device_registry.async_get(coordinator.phone_device_id) is not None
+    ):
+        return
+    phone_device = device_registry.async_get_or_create(
+        config_entry_id=coordinator.entry.entry_id,
+        identifiers={(DOMAIN, phone.phone_id)},
+        name=phone.phone_name,
+        via_device=_get_via_device_from_device_id(
+            device_registry, phone.mobile_app_device_id
+        ),
+    )
+    coordinator.phone_device_id = phone_device.id
+    coordinator.phone_device_via_id = phone.mobile_app_device_id
 
-        entries = hass.config_entries.async_entries(DOMAIN)
-        entry = None
-        for e in entries:
-            if e.unique_id == phone_id:
-                entry = e
-                break
 
-        if not entry:
-            return
+@callback
+def _async_reconcile_alarm_devices(
+    hass: HomeAssistant, coordinator: IPhoneAlarmsSyncCoordinator, result: SyncResult
+) -> None:
+    phone = coordinator.get_phone()
+    if phone is None or not (result.added or result.relabeled):
+        return
+    device_registry = dr.async_get(hass)
+    for alarm_id in result.added:
+        alarm = phone.alarms[alarm_id]
+        device = device_registry.async_get_or_create(
+            config_entry_id=coordinator.entry.entry_id,
+            identifiers={(DOMAIN, phone.phone_id, alarm_id)},
+            name=f"{phone.phone_name} {alarm.label}",
+            via_device=(DOMAIN, phone.phone_id),
+        )
+        coordinator.alarm_device_ids[alarm_id] = device.id
+    for alarm_id in result.relabeled:
+        alarm = phone.alarms[alarm_id]
+        device = device_registry.async_get_device(
+            identifiers={(DOMAIN, phone.phone_id, alarm_id)}
+        )
+        if device is not None:
+            device_registry.async_update_device(
+                device.id, name=f"{phone.phone_name} {alarm.label}"
+            )
 
-        if not hasattr(entry, "runtime_data") or not entry.runtime_data:
-            return
-        coordinator = entry.runtime_data.coordinator
-        phone = coordinator.get_phone()
-        if not phone:
-            return
 
-        device_registry = dr.async_get(hass)
-        phone_device = device_registry.async_get_device(
-            identifiers={(DOMAIN, phone_id)}
+def _schedule_response(
+    coordinator: IPhoneAlarmsSyncCoordinator, limit: int
+) -> dict[str, Any]:
+    next_alarm_at, next_alarm_id = coordinator.get_next_alarm()
+    next_alarm = coordinator.get_alarm(next_alarm_id) if next_alarm_id else None
+    upcoming = []
+    for occurs_at, alarm_id in coordinator.get_upcoming_alarms(limit):
+        alarm = coordinator.get_alarm(alarm_id)
+        upcoming.append(
+            {
+                CONF_ALARM_ID: alarm_id,
+                "label": alarm.label if alarm else None,
+                "datetime": format_timestamp(occurs_at),
+            }
         )
-
-        via_device = _get_via_device_from_device_id(
-            device_registry, phone.mobile_app_device_id
+    return {
+        "next_alarm_id": next_alarm_id,
+        "next_alarm_datetime": format_timestamp(next_alarm_at),
+        "next_alarm_label": next_alarm.label if next_alarm else None,
+        "upcoming": upcoming,
+    }
+
+
+def _sync_response(
+    coordinator: IPhoneAlarmsSyncCoordinator,
+    fingerprint: str | None,
+    alarms_required: bool,
+    result: SyncResult | None = None,
+    throttled: bool = False,
+) -> dict[str, Any]:
+    return {
+        "fingerprint": fingerprint,
+        "changed": result is not None and result.has_changes,
+        "alarms_required": alarms_required,
+        "throttled": throttled,
+        "added": result.added if result else [],
+        "updated": result.updated if result else [],
+        "removed": result.removed if result else [],
+        **_schedule_response(coordinator, DEFAULT_SCHEDULE_LIMIT),
+    }
+
+
+@callback
+def _async_apply_sync(
+    hass: HomeAssistant,
+    coordinator: IPhoneAlarmsSyncCoordinator,
+    alarms: list[dict[str, Any]],
+    client_fingerprint: str | None,
+) -> dict[str, Any]:
+    for alarm_dict in alarms:
+        original_alarm_id = alarm_dict[CONF_ALARM_ID]
+        alarm_dict[CONF_ALARM_ID] = extract_alarm_uuid(original_alarm_id)
+
+    fingerprint = client_fingerprint or compute_alarms_fingerprint(alarms)
+    if coordinator.is_in_sync(fingerprint):
+        return _sync_response(coordinator, fingerprint, False)
+
+    _async_reconcile_phone_device(hass, coordinator)
+    result = coordinator.sync_alarms(alarms, fingerprint)
+    _async_reconcile_alarm_devices(hass, coordinator, result)
+
+    if result.added:
+        async_dispatcher_send(
+            hass,
+            SIGNAL_ALARM_ADDED.format(entry_id=coordinator.entry.entry_id),
+            result.added,
         )
 
-        if not phone_device:
-            phone_device = device_registry.async_get_or_create(
-                config_entry_id=entry.entry_id,
-                identifiers={(DOMAIN, phone_id)},
-                name=phone.phone_name,
-                via_device=via_device,
-            )
-        else:
-            current_via_device = (
-                _get_via_device_from_device_id(
-                    device_registry,
-                    phone_device.via_device_id,
-                )
-                if phone_device.via_device_id
-                else None
-            )
-            if current_via_device != via_device:
-                device_registry.async_update_device(
-                    phone_device.id,
-                    via_device=via_device,
-                )
+    if result.has_changes:
+        for alarm_id in (*result.updated, *result.removed):
+            coordinator.async_publish(alarm_id)
+        coordinator.async_publish(None, *PHONE_SYNC_FIELDS)
 
-        for alarm_dict in alarms:
-            original_alarm_id = alarm_dict[CONF_ALARM_ID]
-            alarm_dict[CONF_ALARM_ID] = extract_alarm_uuid(original_alarm_id)
+    return _sync_response(coordinator, fingerprint, False, result)
 
-        new_alarm_ids, has_changes = coordinator.sync_alarms(alarms)
 
-        for alarm_dict in alarms:
-            alarm_id = alarm_dict[CONF_ALARM_ID]
-            device_registry.async_get_or_create(
-                config_entry_id=entry.entry_id,
-                identifiers={(DOMAIN, phone_id, alarm_id)},
-                name=f"{phone.phone_name} {alarm_dict.get(CONF_LABEL, alarm_id)}",
-                via_device=(DOMAIN, phone_id),
-            )
+def _get_coordinator(
+    hass: HomeAssistant, phone_id: str
+) -> IPhoneAlarmsSyncCoordinator | None:
+    coordinator = hass.data[DOMAIN][DATA_COORDINATORS].get(phone_id)
+    if coordinator is None:
+        _LOGGER.debug("Ignoring service call for unknown phone_id: %s", phone_id)
+    return cast(IPhoneAlarmsSyncCoordinator | None, coordinator)
 
-        if new_alarm_ids:
-            entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
-            for alarm_id in new_alarm_ids:
-                if sensor_add := entry_data.get("sensor_add_entities"):
-                    sensor_entities = _create_alarm_sensor_entities(
-                        coordinator, entry, phone_id, alarm_id
-                    )
-                    sensor_add(sensor_entities)
-                if binary_sensor_add := entry_data.get("binary_sensor_add_entities"):
-                    binary_sensor_entities = _create_binary_sensor_entities(
-                        coordinator, entry, phone_id, alarm_id
-                    )
-                    binary_sensor_add(binary_sensor_entities)
-                if number_add := entry_data.get("number_add_entities"):
-                    number_entities = _create_number_entities(
-                        coordinator, entry, phone_id, alarm_id
-                    )
-                    number_add(number_entities)
 
-        if has_changes:
-            phone = coordinator.get_phone()
-            if phone:
-                coordinator.async_set_updated_data(phone)
+@dataclass(slots=True)
+class _ReportedEvent:
+    listener_id: str | None
+    field: str
+    first: bool
+    trigger_type: str
+    event_data: dict[str, Any]
 
-    async def handle_report_alarm_event(call: ServiceCall) -> None:
+
+def _is_duplicate_event(
+    coordinator: IPhoneAlarmsSyncCoordinator, event_key: str | None
+) -> bool:
+    if event_key is None or coordinator.claim_event_key(event_key):
+        return False
+    _LOGGER.debug("Ignoring duplicate event with key %s", event_key)
+    return True
+
+
+@callback
+def _async_report_event(
+    coordinator: IPhoneAlarmsSyncCoordinator,
+    phone: PhoneData,
+    event: str,
+    alarm_id: str | None = None,
+    occurred_at: datetime | None = None,
+    event_key: str | None = None,
+) -> _ReportedEvent | None:
+    kind = (DEVICE_EVENT_KINDS if alarm_id is None else ALARM_EVENT_KINDS).get(event)
+    if kind is None:
+        _LOGGER.warning("Ignoring unknown event %s for %s", event, phone.phone_id)
+        return None
+    target = phone if alarm_id is None else phone.alarms.get(alarm_id)
+    if target is None:
+        raise ServiceValidationError(f"Alarm {alarm_id} not found")
+    if _is_duplicate_event(coordinator, event_key):
+        return None
+
+    first = getattr(target, kind.field) is None
+    event_obj = coordinator.report_event(kind, alarm_id, occurred_at)
+    phone_id = phone.phone_id
+    return _ReportedEvent(
+        listener_id=alarm_id,
+        field=kind.field,
+        first=first,
+        trigger_type=f"{DOMAIN}_{kind.event}",
+        event_data={
+            "phone_id": phone_id,
+            "alarm_id": event_obj.alarm_id,
+            "event": kind.event,
+            "event_id": event_obj.event_id,
+            "occurred_at": event_obj.occurred_at.isoformat(),
+        },
+    )
+
+
+@callback
+def _async_event_device_id(
+    hass: HomeAssistant, coordinator: IPhoneAlarmsSyncCoordinator, alarm_id: str | None
+) -> str | None:
+    if alarm_id is None:
+        return coordinator.phone_device_id
+    if device_id := coordinator.alarm_device_ids.get(alarm_id):
+        return device_id
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, coordinator.entry.data[CONF_PHONE_ID], alarm_id)}
+    )
+    if device is None:
+        return None
+    coordinator.alarm_device_ids[alarm_id] = device.id
+    return coordinator.alarm_device_ids[alarm_id]
+
+
+@callback
+def _async_commit_reported_events(
+    hass: HomeAssistant,
+    coordinator: IPhoneAlarmsSyncCoordinator,
+    reported_events: list[_ReportedEvent],
+) -> None:
+    for listener_id, field in dict.fromkeys(
+        (reported.listener_id, reported.field) for reported in reported_events
+    ):
+        coordinator.async_publish(listener_id, field)
+
+    signal = SIGNAL_EVENT_SENSOR_ADDED.format(entry_id=coordinator.entry.entry_id)
+    for reported in reported_events:
+        if reported.first:
+            async_dispatcher_send(hass, signal, reported.listener_id, reported.field)
+
+    for reported in reported_events:
+        hass.bus.async_fire(EVENT_ALARM_EVENT, reported.event_data)
+        device_id = _async_event_device_id(hass, coordinator, reported.listener_id)
+        if device_id:
+            hass.bus.async_fire(reported.trigger_type, {"device_id": device_id})
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    hass.data.setdefault(DOMAIN, {}).setdefault(DATA_COORDINATORS, {})
+    history = EventHistory(
+        hass,
+        hass.config.path(HISTORY_DB_FILE),
+        HISTORY_MAX_EVENTS,
+        HISTORY_PRUNE_SLACK,
+    )
+    hass.data[DOMAIN][DATA_HISTORY] = history
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, history.async_close)
+    hass.http.register_view(ShortcutQRCodeView(hass))
+
+    async def handle_sync_alarms(call: ServiceCall) -> ServiceResponse:
         phone_id = call.data[CONF_PHONE_ID]
-        alarm_id = extract_alarm_uuid(call.data[CONF_ALARM_ID])
-        event = call.data[CONF_EVENT]
+        alarms = call.data.get(CONF_ALARMS)
+        client_fingerprint = call.data.get(CONF_FINGERPRINT)
 
-        entries = hass.config_entries.async_entries(DOMAIN)
-        entry = None
-        for e in entries:
-            if e.unique_id == phone_id:
-                entry = e
-                break
+        coordinator = _get_coordinator(hass, phone_id)
+        if coordinator is None or not (phone := coordinator.get_phone()):
+            raise ServiceValidationError(f"Phone {phone_id} not found")
 
-        if not entry:
-            return
+        if alarms is None:
+            in_sync = coordinator.is_in_sync(client_fingerprint)
+            return _sync_response(coordinator, phone.sync_fingerprint, not in_sync)
 
-        if not hasattr(entry, "runtime_data") or not entry.runtime_data:
-            return
-        coordinator = entry.runtime_data.coordinator
-        phone = coordinator.get_phone()
-        if not phone:
-            return
+        response = await coordinator.sync_admission.async_submit(
+            partial(_async_apply_sync, hass, coordinator, alarms, client_fingerprint)
+        )
+        if response is not None:
+            return response
 
-        alarm = coordinator.get_alarm(alarm_id)
-        was_first_event = False
-        if alarm:
-            if event == "goes_off" and not alarm.last_event_goes_off_at:
-                was_first_event = True
-            elif event == "snoozed" and not alarm.last_event_snoozed_at:
-                was_first_event = True
-            elif event == "stopped" and not alarm.last_event_stopped_at:
-                was_first_event = True
-
-        event_obj = coordinator.report_alarm_event(alarm_id, event)
-        phone = coordinator.get_phone()
-        if phone:
-            coordinator.async_set_updated_data(phone)
-
-        if was_first_event:
-            entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
-            if sensor_add := entry_data.get("sensor_add_entities"):
-                sensor_entities = _create_alarm_sensor_entities(
-                    coordinator, entry, phone_id, alarm_id
-                )
-                target_key = f"last_event_{event}_at"
-                new_entities = [
-                    e for e in sensor_entities if e.entity_description.key == target_key
-                ]
-                if new_entities:
-                    sensor_add(new_entities)
-
-        hass.bus.async_fire(
-            EVENT_ALARM_EVENT,
-            {
-                "phone_id": phone_id,
-                "alarm_id": alarm_id,
-                "event": event,
-                "event_id": event_obj.event_id,
-                "occurred_at": event_obj.occurred_at,
-            },
+        _LOGGER.debug("Dropping sync for %s: rate limit reached", phone_id)
+        in_sync = coordinator.is_in_sync(client_fingerprint)
+        return _sync_response(
+            coordinator, phone.sync_fingerprint, not in_sync, throttled=True
         )
 
-        device_registry = dr.async_get(hass)
-        device = device_registry.async_get_device(
-            identifiers={(DOMAIN, phone_id, alarm_id)}
+    async def handle_report_alarm_event(call: ServiceCall) -> None:
+        alarm_id = extract_alarm_uuid(call.data[CONF_ALARM_ID])
+        coordinator = _get_coordinator(hass, call.data[CONF_PHONE_ID])
+        if coordinator is None or not (phone := coordinator.get_phone()):
+            return
+
+        reported = _async_report_event(
+            coordinator,
+            phone,
+            call.data[CONF_EVENT],
+            alarm_id,
+            event_key=call.data.get(CONF_EVENT_KEY),
         )
-        if device:
-            hass.bus.async_fire(
-                f"{DOMAIN}_{event}",
-                {
-                    "device_id": device.id,
-                },
-            )
+        if reported is not None:
+            _async_commit_reported_events(hass, coordinator, [reported])
 
     async def handle_report_device_event(call: ServiceCall) -> None:
         phone_id = call.data.get(CONF_PHONE_ID)
@@ -232,264 +424,109 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
             )
             return
 
-        entries = hass.config_entries.async_entries(DOMAIN)
-        entry = None
-        for e in entries:
-            if e.unique_id == phone_id:
-                entry = e
-                break
-
-        if not entry:
-            return
-
-        if not hasattr(entry, "runtime_data") or not entry.runtime_data:
-            return
-        coordinator = entry.runtime_data.coordinator
-        phone = coordinator.get_phone()
-        if not phone:
+        coordinator = _get_coordinator(hass, phone_id)
+        if coordinator is None or not (phone := coordinator.get_phone()):
             return
 
-        if event.startswith("wakeup_"):
-            event_name = event.replace("wakeup_", "")
-            was_first_event = False
-            if event_name == "goes_off" and not phone.wakeup_last_event_goes_off_at:
-                was_first_event = True
-            elif event_name == "snoozed" and not phone.wakeup_last_event_snoozed_at:
-                was_first_event = True
-            elif event_name == "stopped" and not phone.wakeup_last_event_stopped_at:
-                was_first_event = True
-
-            event_obj = coordinator.report_wakeup_event(event_name)
-            phone = coordinator.get_phone()
-            if phone:
-                coordinator.async_set_updated_data(phone)
-
-            if was_first_event:
-                entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
-                if sensor_add := entry_data.get("sensor_add_entities"):
-                    sensor_entities = _create_phone_event_sensor_entities(
-                        coordinator, entry, phone_id
-                    )
-                    target_key = f"wakeup_last_event_{event_name}_at"
-                    new_entities = [
-                        e
-                        for e in sensor_entities
-                        if e.entity_description.key == target_key
-                    ]
-                    if new_entities:
-                        sensor_add(new_entities)
-
-            hass.bus.async_fire(
-                EVENT_ALARM_EVENT,
-                {
-                    "phone_id": phone_id,
-                    "alarm_id": "wakeup",
-                    "event": event_name,
-                    "event_id": event_obj.event_id,
-                    "occurred_at": event_obj.occurred_at,
-                },
-            )
+        reported = _async_report_event(
+            coordinator, phone, event, event_key=call.data.get(CONF_EVENT_KEY)
+        )
+        if reported is not None:
+            _async_commit_reported_events(hass, coordinator, [reported])
 
-            device_registry = dr.async_get(hass)
-            device = device_registry.async_get_device(identifiers={(DOMAIN, phone_id)})
-            if device:
-                hass.bus.async_fire(
-                    f"{DOMAIN}_{event_name}",
-                    {
-                        "device_id": device.id,
-                    },
-                )
+    async def handle_report_events(call: ServiceCall) -> None:
+        coordinator = _get_coordinator(hass, call.data[CONF_PHONE_ID])
+        if coordinator is None or not (phone := coordinator.get_phone()):
+            return
 
-        elif event.startswith("any_"):
-            event_name = event.replace("any_", "")
-            was_first_event = False
-            if event_name == "goes_off" and not phone.any_last_event_goes_off_at:
-                was_first_event = True
-            elif event_name == "snoozed" and not phone.any_last_event_snoozed_at:
-                was_first_event = True
-            elif event_name == "stopped" and not phone.any_last_event_stopped_at:
-                was_first_event = True
-
-            event_obj = coordinator.report_any_event(event_name)
-            phone = coordinator.get_phone()
-            if phone:
-                coordinator.async_set_updated_data(phone)
-
-            if was_first_event:
-                entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
-                if sensor_add := entry_data.get("sensor_add_entities"):
-                    sensor_entities = _create_phone_event_sensor_entities(
-                        coordinator, entry, phone_id
+        events = []
+        for item in call.data[CONF_EVENTS]:
+            alarm_id = item.get(CONF_ALARM_ID)
+            if alarm_id is not None:
+                alarm_id = extract_alarm_uuid(alarm_id)
+                if alarm_id not in phone.alarms:
+                    _LOGGER.warning(
+                        "Ignoring %s event for unknown alarm %s on %s",
+                        item[CONF_EVENT],
+                        alarm_id,
+                        phone.phone_id,
                     )
-                    target_key = f"any_last_event_{event_name}_at"
-                    new_entities = [
-                        e
-                        for e in sensor_entities
-                        if e.entity_description.key == target_key
-                    ]
-                    if new_entities:
-                        sensor_add(new_entities)
-
-            hass.bus.async_fire(
-                EVENT_ALARM_EVENT,
-                {
-                    "phone_id": phone_id,
-                    "alarm_id": "any",
-                    "event": event_name,
-                    "event_id": event_obj.event_id,
-                    "occurred_at": event_obj.occurred_at,
-                },
-            )
-
-            device_registry = dr.async_get(hass)
-            device = device_registry.async_get_device(identifiers={(DOMAIN, phone_id)})
-            if device:
-                hass.bus.async_fire(
-                    f"{DOMAIN}_{event_name}",
-                    {
-                        "device_id": device.id,
-                    },
+                    continue
+            occurred_at = item.get(CONF_OCCURRED_AT)
+            events.append(
+                (
+                    alarm_id,
+                    item[CONF_EVENT],
+                    dt_util.as_utc(occurred_at) if occurred_at else None,
+                    item.get(CONF_EVENT_KEY),
                 )
-
-        elif event == "bedtime_starts":
-            was_first_event = not phone.bedtime_last_event_at
-
-            event_obj = coordinator.report_bedtime_event()
-            phone = coordinator.get_phone()
-            if phone:
-                coordinator.async_set_updated_data(phone)
-
-            if was_first_event:
-                entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
-                if sensor_add := entry_data.get("sensor_add_entities"):
-                    sensor_entities = _create_phone_event_sensor_entities(
-                        coordinator, entry, phone_id
-                    )
-                    target_key = "bedtime_last_event_at"
-                    new_entities = [
-                        e
-                        for e in sensor_entities
-                        if e.entity_description.key == target_key
-                    ]
-                    if new_entities:
-                        sensor_add(new_entities)
-
-            hass.bus.async_fire(
-                EVENT_ALARM_EVENT,
-                {
-                    "phone_id": phone_id,
-                    "alarm_id": "bedtime",
-                    "event": EVENT_BEDTIME_STARTS,
-                    "event_id": event_obj.event_id,
-                    "occurred_at": event_obj.occurred_at,
-                },
             )
 
-            device_registry = dr.async_get(hass)
-            device = device_registry.async_get_device(identifiers={(DOMAIN, phone_id)})
-            if device:
-                hass.bus.async_fire(
-                    f"{DOMAIN}_{EVENT_BEDTIME_STARTS}",
-                    {
-                        "device_id": device.id,
-                    },
-                )
-
-        elif event == "waking_up":
-            was_first_event = not phone.waking_up_last_event_at
-
-            event_obj = coordinator.report_waking_up_event()
-            phone = coordinator.get_phone()
-            if phone:
-                coordinator.async_set_updated_data(phone)
-
-            if was_first_event:
-                entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
-                if sensor_add := entry_data.get("sensor_add_entities"):
-                    sensor_entities = _create_phone_event_sensor_entities(
-                        coordinator, entry, phone_id
-                    )
-                    target_key = "waking_up_last_event_at"
-                    new_entities = [
-                        e
-                        for e in sensor_entities
-                        if e.entity_description.key == target_key
-                    ]
-                    if new_entities:
-                        sensor_add(new_entities)
-
-            hass.bus.async_fire(
-                EVENT_ALARM_EVENT,
-                {
-                    "phone_id": phone_id,
-                    "alarm_id": "waking_up",
-                    "event": EVENT_WAKING_UP,
-                    "event_id": event_obj.event_id,
-                    "occurred_at": event_obj.occurred_at,
-                },
-            )
-
-            device_registry = dr.async_get(hass)
-            device = device_registry.async_get_device(identifiers={(DOMAIN, phone_id)})
-            if device:
-                hass.bus.async_fire(
-                    f"{DOMAIN}_{EVENT_WAKING_UP}",
-                    {
-                        "device_id": device.id,
-                    },
-                )
-
-        elif event == "wind_down_starts":
-            was_first_event = not phone.wind_down_last_event_at
-
-            event_obj = coordinator.report_wind_down_event()
-            phone = coordinator.get_phone()
-            if phone:
-                coordinator.async_set_updated_data(phone)
-
-            if was_first_event:
-                entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
-                if sensor_add := entry_data.get("sensor_add_entities"):
-                    sensor_entities = _create_phone_event_sensor_entities(
-                        coordinator, entry, phone_id
-                    )
-                    target_key = "wind_down_last_event_at"
-                    new_entities = [
-                        e
-                        for e in sensor_entities
-                        if e.entity_description.key == target_key
-                    ]
-                    if new_entities:
-                        sensor_add(new_entities)
-
-            hass.bus.async_fire(
-                EVENT_ALARM_EVENT,
-                {
-                    "phone_id": phone_id,
-                    "alarm_id": "wind_down",
-                    "event": EVENT_WIND_DOWN_STARTS,
-                    "event_id": event_obj.event_id,
-                    "occurred_at": event_obj.occurred_at,
-                },
+        reported_events = []
+        for alarm_id, event, occurred_at, event_key in events:
+            reported = _async_report_event(
+                coordinator, phone, event, alarm_id, occurred_at, event_key
             )
+            if reported is not None:
+                reported_events.append(reported)
+        _async_commit_reported_events(hass, coordinator, reported_events)
+
+    async def handle_query_events(call: ServiceCall) -> ServiceResponse:
+        alarm_id = call.data.get(CONF_ALARM_ID)
+        start = call.data.get(CONF_START)
+        end = call.data.get(CONF_END)
+        events, next_cursor = await history.async_query(
+            call.data[CONF_PHONE_ID],
+            start=dt_util.as_utc(start) if start else None,
+            end=dt_util.as_utc(end) if end else None,
+            alarm_id=extract_alarm_uuid(alarm_id) if alarm_id else None,
+            limit=call.data[CONF_LIMIT],
+            cursor=call.data.get(CONF_CURSOR),
+        )
+        return {"events": events, "next_cursor": next_cursor}
 
-            device_registry = dr.async_get(hass)
-            device = device_registry.async_get_device(identifiers={(DOMAIN, phone_id)})
-            if device:
-                hass.bus.async_fire(
-                    f"{DOMAIN}_{EVENT_WIND_DOWN_STARTS}",
-                    {
-                        "device_id": device.id,
-                    },
-                )
+    async def handle_get_schedule(call: ServiceCall) -> ServiceResponse:
+        phone_id = call.data[CONF_PHONE_ID]
+        coordinator = _get_coordinator(hass, phone_id)
+        if coordinator is None or not (phone := coordinator.get_phone()):
+            raise ServiceValidationError(f"Phone {phone_id} not found")
+        return {
+            "fingerprint": phone.sync_fingerprint,
+            **_schedule_response(coordinator, call.data[CONF_LIMIT]),
+        }
 
-    hass.services.async_register(DOMAIN, "sync_alarms", handle_sync_alarms)
+    hass.services.async_register(
+        DOMAIN,
+        "sync_alarms",
+        handle_sync_alarms,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
     hass.services.async_register(
         DOMAIN, "report_alarm_event", handle_report_alarm_event
     )
     hass.services.async_register(
         DOMAIN, "report_device_event", handle_report_device_event
     )
+    hass.services.async_register(
+        DOMAIN,
+        "report_events",
+        handle_report_events,
+        schema=REPORT_EVENTS_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "query_events",
+        handle_query_events,
+        schema=QUERY_EVENTS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "get_schedule",
+        handle_get_schedule,
+        schema=GET_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
     return True
 
@@ -545,12 +582,11 @@ async def async_migrate_entry(
             for other_entry in other_entries:
                 await hass.config_entries.async_remove(other_entry.entry_id)
 
-    if config_entry.version == 2:
-        phones_dict = config_entry.options.get("phones", {})
-        if not phones_dict:
-            hass.config_entries.async_update_entry(config_entry, version=3)
-            return True
+    if config_entry.version == 2 and not config_entry.options.get("phones"):
+        hass.config_entries.async_update_entry(config_entry, version=3)
 
+    if config_entry.version == 2:
+        phones_dict = config_entry.options["phones"]
         first_phone_id = next(iter(phones_dict))
         first_phone = phones_dict[first_phone_id]
 
@@ -582,16 +618,23 @@ async def async_migrate_entry(
                     ),
                 },
             )
-            if (
-                hasattr(result, "type")
-                and result.type == "create_entry"  # type: ignore[attr-defined]
-                and hasattr(result, "result")
-            ):
-                new_entry = result.result  # type: ignore[attr-defined]
+            if result["type"] == FlowResultType.CREATE_ENTRY:
+                new_entry = result["result"]
                 hass.config_entries.async_update_entry(
                     new_entry,
-                    options={"alarms": phone_data.get("alarms", {})},
+                    options=await async_migrate_runtime_to_store(
+                        hass,
+                        new_entry.entry_id,
+                        {"alarms": phone_data.get("alarms", {})},
+                    ),
                 )
+                await hass.config_entries.async_reload(new_entry.entry_id)
+
+    if config_entry.version == 3:
+        options = await async_migrate_runtime_to_store(
+            hass, config_entry.entry_id, dict(config_entry.options)
+        )
+        hass.config_entries.async_update_entry(config_entry, options=options, version=4)
 
     return True
 
@@ -599,23 +642,23 @@ async def async_migrate_entry(
 async def async_setup_entry(
     hass: HomeAssistant, entry: IPhoneAlarmsSyncConfigEntry
 ) -> bool:
-    coordinator = IPhoneAlarmsSyncCoordinator(hass, entry)
+    coordinator = IPhoneAlarmsSyncCoordinator(
+        hass, entry, hass.data[DOMAIN][DATA_HISTORY]
+    )
+    await coordinator.async_load()
     await coordinator.async_config_entry_first_refresh()
 
     entry.runtime_data = IPhoneAlarmsSyncData(coordinator=coordinator)
+    hass.data.setdefault(DOMAIN, {}).setdefault(DATA_COORDINATORS, {})[
+        entry.unique_id
+    ] = coordinator
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, coordinator.async_flush)
+    )
+    coordinator.async_start_scheduler()
+    entry.async_on_unload(coordinator.async_stop_scheduler)
 
-    device_registry = dr.async_get(hass)
-    phone = coordinator.get_phone()
-    if phone:
-        via_device = _get_via_device_from_device_id(
-            device_registry, phone.mobile_app_device_id
-        )
-        device_registry.async_get_or_create(
-            config_entry_id=entry.entry_id,
-            identifiers={(DOMAIN, phone.phone_id)},
-            name=phone.phone_name,
-            via_device=via_device,
-        )
+    _async_reconcile_phone_device(hass, coordinator)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -625,5 +668,20 @@ async def async_setup_entry(
 async def async_unload_entry(
     hass: HomeAssistant, entry: IPhoneAlarmsSyncConfigEntry
 ) -> bool:
+    entry.runtime_data.coordinator.sync_admission.async_flush()
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    await entry.runtime_data.coordinator.async_flush()
+    if unload_ok:
+        coordinators = hass.data[DOMAIN][DATA_COORDINATORS]
+        for phone_id, coordinator in list(coordinators.items()):
+            if coordinator is entry.runtime_data.coordinator:
+                del coordinators[phone_id]
     return bool(unload_ok)
+
+
+async def async_remove_entry(
+    hass: HomeAssistant, entry: IPhoneAlarmsSyncConfigEntry
+) -> None:
+    await create_store(hass, entry.entry_id).async_remove()
+    if entry.unique_id:
+        await hass.data[DOMAIN][DATA_HISTORY].async_delete_phone(entry.unique_id)
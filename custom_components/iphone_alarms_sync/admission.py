@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import SYNC_RATE_LIMIT_PERIOD
+
+SyncApplyFn = Callable[[], dict[str, Any]]
+
+
+class SyncAdmission:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        window: float,
+        rate_limit: int,
+        on_update: CALLBACK_TYPE,
+    ) -> None:
+        self.hass = hass
+        self.merged = 0
+        self.dropped = 0
+        self._window = window
+        self._rate_limit = rate_limit
+        self._on_update = on_update
+        self._applied_at: deque[float] = deque()
+        self._pending: asyncio.Future[dict[str, Any]] | None = None
+        self._pending_apply: SyncApplyFn | None = None
+        self._unsub_flush: CALLBACK_TYPE | None = None
+
+    async def async_submit(self, apply: SyncApplyFn) -> dict[str, Any] | None:
+        if self._pending is not None:
+            self._pending_apply = apply
+            self.merged += 1
+            self._on_update()
+            return await asyncio.shield(self._pending)
+
+        now = time.monotonic()
+        while self._applied_at and now - self._applied_at[0] >= SYNC_RATE_LIMIT_PERIOD:
+            self._applied_at.popleft()
+        if len(self._applied_at) >= self._rate_limit:
+            self.dropped += 1
+            self._on_update()
+            return None
+
+        delay = self._applied_at[-1] + self._window - now if self._applied_at else 0
+        if delay <= 0:
+            self._applied_at.append(now)
+            return apply()
+
+        self._pending = self.hass.loop.create_future()
+        self._pending_apply = apply
+        self._unsub_flush = async_call_later(
+            self.hass, delay, self._async_handle_flush_timer
+        )
+        return await asyncio.shield(self._pending)
+
+    @callback
+    def _async_handle_flush_timer(self, _now: datetime) -> None:
+        self._unsub_flush = None
+        self.async_flush()
+
+    @callback
+    def async_flush(self) -> None:
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        if self._pending is None or self._pending_apply is None:
+            return
+        pending, apply = self._pending, self._pending_apply
+        self._pending = None
+        self._pending_apply = None
+        self._applied_at.append(time.monotonic())
+        try:
+            pending.set_result(apply())
+        except Exception as err:
+            pending.set_exception(err)
@@ -1,57 +1,63 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from operator import attrgetter
+
 from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
-from .coordinator import IPhoneAlarmsSyncConfigEntry, IPhoneAlarmsSyncCoordinator
+from .const import DOMAIN, SIGNAL_ALARM_ADDED
+from .coordinator import (
+    AlarmData,
+    IPhoneAlarmsSyncConfigEntry,
+    IPhoneAlarmsSyncCoordinator,
+)
+from .entity import AlarmValueFn, IPhoneAlarmsSyncEntity, alarm_value_fn
+from .utils import WEEKDAY_MAP
+
+
+@dataclass(frozen=True, kw_only=True)
+class IPhoneAlarmsSyncBinarySensorEntityDescription(BinarySensorEntityDescription):
+    value_fn: AlarmValueFn[bool]
+
+
+def _repeats_on(day: str, alarm: AlarmData) -> bool:
+    return bool(alarm.repeat_days >> WEEKDAY_MAP[day] & 1)
 
-BINARY_SENSOR_TYPES: tuple[BinarySensorEntityDescription, ...] = (
-    BinarySensorEntityDescription(
+
+BINARY_SENSOR_TYPES: tuple[IPhoneAlarmsSyncBinarySensorEntityDescription, ...] = (
+    IPhoneAlarmsSyncBinarySensorEntityDescription(
         key="enabled",
         name="Enabled",
+        value_fn=alarm_value_fn(attrgetter("enabled")),
     ),
-    BinarySensorEntityDescription(
+    IPhoneAlarmsSyncBinarySensorEntityDescription(
         key="repeats",
         name="Repeats",
+        entity_registry_enabled_default=False,
+        value_fn=alarm_value_fn(attrgetter("repeats")),
     ),
-    BinarySensorEntityDescription(
+    IPhoneAlarmsSyncBinarySensorEntityDescription(
         key="allows_snooze",
         name="Allows Snooze",
+        value_fn=alarm_value_fn(attrgetter("allows_snooze")),
     ),
-    BinarySensorEntityDescription(
-        key="repeats_monday",
-        name="Repeats Monday",
-    ),
-    BinarySensorEntityDescription(
-        key="repeats_tuesday",
-        name="Repeats Tuesday",
-    ),
-    BinarySensorEntityDescription(
-        key="repeats_wednesday",
-        name="Repeats Wednesday",
-    ),
-    BinarySensorEntityDescription(
-        key="repeats_thursday",
-        name="Repeats Thursday",
-    ),
-    BinarySensorEntityDescription(
-        key="repeats_friday",
-        name="Repeats Friday",
-    ),
-    BinarySensorEntityDescription(
-        key="repeats_saturday",
-        name="Repeats Saturday",
-    ),
-    BinarySensorEntityDescription(
-        key="repeats_sunday",
-        name="Repeats Sunday",
+    *(
+        IPhoneAlarmsSyncBinarySensorEntityDescription(
+            key=f"repeats_{day.lower()}",
+            name=f"Repeats {day}",
+            entity_registry_enabled_default=False,
+            value_fn=alarm_value_fn(partial(_repeats_on, day)),
+        )
+        for day in WEEKDAY_MAP
     ),
 )
 
@@ -88,10 +94,6 @@ async def async_setup_entry(
     if not phone:
         return
 
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN].setdefault(entry.entry_id, {})
-    hass.data[DOMAIN][entry.entry_id]["binary_sensor_add_entities"] = async_add_entities
-
     for alarm_id, alarm in phone.alarms.items():
         entities.extend(
             _create_binary_sensor_entities(coordinator, entry, phone.phone_id, alarm_id)
@@ -99,23 +101,45 @@ async def async_setup_entry(
 
     async_add_entities(entities)
 
+    @callback
+    def _async_add_alarms(alarm_ids: list[str]) -> None:
+        async_add_entities(
+            [
+                entity
+                for alarm_id in alarm_ids
+                for entity in _create_binary_sensor_entities(
+                    coordinator, entry, phone.phone_id, alarm_id
+                )
+            ]
+        )
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_ALARM_ADDED.format(entry_id=entry.entry_id), _async_add_alarms
+        )
+    )
+
+
+class IPhoneAlarmsSyncBinarySensor(IPhoneAlarmsSyncEntity, BinarySensorEntity):
+    _alarm_id: str
+    entity_description: IPhoneAlarmsSyncBinarySensorEntityDescription
 
-class IPhoneAlarmsSyncBinarySensor(
-    CoordinatorEntity[IPhoneAlarmsSyncCoordinator], BinarySensorEntity
-):
     def __init__(
         self,
         coordinator: IPhoneAlarmsSyncCoordinator,
         entry: IPhoneAlarmsSyncConfigEntry,
         phone_id: str,
         alarm_id: str,
-        description: BinarySensorEntityDescription,
+        description: IPhoneAlarmsSyncBinarySensorEntityDescription,
     ) -> None:
         super().__init__(coordinator)
         self._entry = entry
         self._phone_id = phone_id
         self._alarm_id = alarm_id
-        self._description = description
+        self.entity_description = description
+        self._value_fn: Callable[[], bool | None] = partial(
+            description.value_fn, coordinator, alarm_id
+        )
         self._attr_unique_id = (
             f"{entry.entry_id}_{phone_id}_{alarm_id}_{description.key}"
         )
@@ -131,41 +155,7 @@ class IPhoneAlarmsSyncBinarySensor(
             name=f"{phone.phone_name} {alarm.label}",
             via_device=(DOMAIN, phone_id),
         )
-        if description.key in (
-            "repeats",
-            "repeats_monday",
-            "repeats_tuesday",
-            "repeats_wednesday",
-            "repeats_thursday",
-            "repeats_friday",
-            "repeats_saturday",
-            "repeats_sunday",
-        ):
-            self._attr_entity_registry_enabled_default = False
 
     @property
     def is_on(self) -> bool | None:
-        alarm = self.coordinator.get_alarm(self._alarm_id)
-        if not alarm:
-            return None
-        if self._description.key == "enabled":
-            return bool(alarm.enabled)
-        if self._description.key == "repeats":
-            return bool(alarm.repeats)
-        if self._description.key == "allows_snooze":
-            return bool(alarm.allows_snooze)
-        if self._description.key == "repeats_monday":
-            return "Monday" in alarm.repeat_days
-        if self._description.key == "repeats_tuesday":
-            return "Tuesday" in alarm.repeat_days
-        if self._description.key == "repeats_wednesday":
-            return "Wednesday" in alarm.repeat_days
-        if self._description.key == "repeats_thursday":
-            return "Thursday" in alarm.repeat_days
-        if self._description.key == "repeats_friday":
-            return "Friday" in alarm.repeat_days
-        if self._description.key == "repeats_saturday":
-            return "Saturday" in alarm.repeat_days
-        if self._description.key == "repeats_sunday":
-            return "Sunday" in alarm.repeat_days
-        return None
+        return self._value_fn()
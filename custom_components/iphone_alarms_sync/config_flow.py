@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Mapping
 from typing import Any
 
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.components import mobile_app
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import device_registry as dr
 
@@ -14,8 +15,21 @@ from .const import (
     CONF_MOBILE_APP_DEVICE_ID,
     CONF_PHONE_ID,
     CONF_PHONE_NAME,
+    CONF_SAVE_DELAY,
+    CONF_SYNC_COALESCE_WINDOW,
     CONF_SYNC_DISABLED_ALARMS,
+    CONF_SYNC_RATE_LIMIT,
+    DATA_HISTORY,
+    DEFAULT_SAVE_DELAY,
+    DEFAULT_SYNC_COALESCE_WINDOW,
+    DEFAULT_SYNC_RATE_LIMIT,
     DOMAIN,
+    MAX_SAVE_DELAY,
+    MAX_SYNC_COALESCE_WINDOW,
+    MAX_SYNC_RATE_LIMIT,
+    QR_CODE_ALARM_EVENT,
+    QR_CODE_DEVICE_EVENT,
+    QR_CODE_SYNC,
     SHORTCUT_ALARM_EVENT_URL,
     SHORTCUT_DEVICE_EVENT_URL,
     SHORTCUT_SYNC_URL,
@@ -24,7 +38,7 @@ from .coordinator import (
     IPhoneAlarmsSyncConfigEntry,
     IPhoneAlarmsSyncCoordinator,
 )
-from .qr_code import generate_qr_code_data_url
+from .qr_code import qr_code_url
 
 
 def slugify(text: str) -> str:
@@ -34,8 +48,38 @@ def slugify(text: str) -> str:
     return text.strip("_")
 
 
+@callback
+def _async_mobile_app_devices(hass: HomeAssistant) -> dict[str, str | None]:
+    device_registry = dr.async_get(hass)
+    return {
+        device.id: device.name
+        for entry in hass.config_entries.async_entries(mobile_app.DOMAIN)
+        for device in dr.async_entries_for_config_entry(device_registry, entry.entry_id)
+    }
+
+
+def _settings_schema(data: Mapping[str, Any]) -> vol.Schema:
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_SAVE_DELAY, default=data.get(CONF_SAVE_DELAY, DEFAULT_SAVE_DELAY)
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_SAVE_DELAY)),
+            vol.Required(
+                CONF_SYNC_COALESCE_WINDOW,
+                default=data.get(
+                    CONF_SYNC_COALESCE_WINDOW, DEFAULT_SYNC_COALESCE_WINDOW
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_SYNC_COALESCE_WINDOW)),
+            vol.Required(
+                CONF_SYNC_RATE_LIMIT,
+                default=data.get(CONF_SYNC_RATE_LIMIT, DEFAULT_SYNC_RATE_LIMIT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_SYNC_RATE_LIMIT)),
+        }
+    )
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore[call-arg]
-    VERSION = 3
+    VERSION = 4
 
     def __init__(self):
         super().__init__()
@@ -72,26 +116,10 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore[call
     async def async_step_select_mobile_app(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        device_registry = dr.async_get(self.hass)
-        mobile_app_devices = [
-            device.id
-            for device in device_registry.devices.values()
-            if any(
-                entry.domain == mobile_app.DOMAIN
-                for entry_id in device.config_entries
-                if (entry := self.hass.config_entries.async_get_entry(entry_id))
-            )
-        ]
-
-        if not mobile_app_devices:
+        device_options = _async_mobile_app_devices(self.hass)
+        if not device_options:
             return self.async_abort(reason="no_mobile_app_devices")
 
-        device_options = {}
-        for device_id in mobile_app_devices:
-            device = device_registry.async_get(device_id)
-            if device:
-                device_options[device.id] = device.name
-
         errors: dict[str, str] = {}
 
         if user_input is None:
@@ -106,7 +134,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore[call
 
         mobile_app_device_id = user_input.get(CONF_MOBILE_APP_DEVICE_ID)
 
-        device = device_registry.async_get(mobile_app_device_id)
+        device = dr.async_get(self.hass).async_get(mobile_app_device_id)
         if not device:
             errors["base"] = "device_not_found"
             schema = vol.Schema(
@@ -183,20 +211,19 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore[call
                     vol.Required(CONF_SYNC_DISABLED_ALARMS, default=True): bool,
                 }
             )
-            sync_qr_code = generate_qr_code_data_url(SHORTCUT_SYNC_URL)
-            alarm_event_qr_code = generate_qr_code_data_url(SHORTCUT_ALARM_EVENT_URL)
-            device_event_qr_code = generate_qr_code_data_url(SHORTCUT_DEVICE_EVENT_URL)
             return self.async_show_form(
                 step_id="confirm",
                 data_schema=schema,
                 description_placeholders={
                     "phone_name": self._phone_name,
                     "phone_id": self._phone_id,
-                    "sync_qr_code": sync_qr_code,
+                    "sync_qr_code": qr_code_url(self.hass, QR_CODE_SYNC),
                     "sync_shortcut_url": SHORTCUT_SYNC_URL,
-                    "alarm_event_qr_code": alarm_event_qr_code,
+                    "alarm_event_qr_code": qr_code_url(self.hass, QR_CODE_ALARM_EVENT),
                     "alarm_event_shortcut_url": SHORTCUT_ALARM_EVENT_URL,
-                    "device_event_qr_code": device_event_qr_code,
+                    "device_event_qr_code": qr_code_url(
+                        self.hass, QR_CODE_DEVICE_EVENT
+                    ),
                     "device_event_shortcut_url": SHORTCUT_DEVICE_EVENT_URL,
                 },
             )
@@ -309,6 +336,7 @@ class OptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
                 "events",
                 "sync_shortcut",
                 "event_shortcuts",
+                "settings",
             ],
         )
 
@@ -324,22 +352,10 @@ class OptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
         if not phone:
             return self.async_abort(reason="phone_not_found")
 
-        device_registry = dr.async_get(self.hass)
-        mobile_app_devices = [
-            device.id
-            for device in device_registry.devices.values()
-            if any(
-                entry.domain == mobile_app.DOMAIN
-                for entry_id in device.config_entries
-                if (entry := self.hass.config_entries.async_get_entry(entry_id))
-            )
-        ]
-
-        device_options = {None: "None"}
-        for device_id in mobile_app_devices:
-            device = device_registry.async_get(device_id)
-            if device:
-                device_options[device.id] = device.name
+        device_options: dict[str | None, str | None] = {
+            None: "None",
+            **_async_mobile_app_devices(self.hass),
+        }
 
         if user_input is None:
             schema = vol.Schema(
@@ -428,6 +444,10 @@ class OptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
                 title=phone_name,
                 data=new_data,
             )
+        if new_phone_id != old_phone_id:
+            await self.hass.data[DOMAIN][DATA_HISTORY].async_rename_phone(
+                old_phone_id, new_phone_id
+            )
 
         device_registry = dr.async_get(self.hass)
         phone_device = device_registry.async_get_device(
@@ -446,6 +466,21 @@ class OptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
         await self.hass.config_entries.async_reload(self.config_entry.entry_id)
         return await self.async_step_init()
 
+    async def async_step_settings(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        if user_input is None:
+            return self.async_show_form(
+                step_id="settings",
+                data_schema=_settings_schema(self.config_entry.data),
+            )
+
+        self.hass.config_entries.async_update_entry(
+            self.config_entry, data={**self.config_entry.data, **user_input}
+        )
+        await self.hass.config_entries.async_reload(self.config_entry.entry_id)
+        return await self.async_step_init()
+
     async def async_step_overview(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -457,7 +492,7 @@ class OptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
             return self.async_abort(reason="phone_not_found")
 
         all_alarms = coordinator.get_all_alarms()
-        recent_events = coordinator.get_events(limit=10)
+        recent_events = await coordinator.async_get_history(limit=10)
 
         last_sync = phone.synced_at
 
@@ -469,7 +504,7 @@ class OptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
                 "phone_name": phone.phone_name,
                 "phone_id": phone.phone_id,
                 "alarm_count": str(alarm_count),
-                "last_sync": last_sync or "Never",
+                "last_sync": last_sync.isoformat() if last_sync else "Never",
                 "recent_events": str(len(recent_events)),
             },
         )
@@ -480,12 +515,13 @@ class OptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
         coordinator = self._get_coordinator()
         if coordinator is None:
             return self.async_abort(reason="integration_not_ready")
-        events = coordinator.get_events(limit=20)
+        events = await coordinator.async_get_history(limit=20)
 
         if user_input is None:
             if events:
                 event_list = "\n".join(
-                    f"- {event.occurred_at}: {event.event} (alarm: {event.alarm_id})"
+                    f"- {event['occurred_at']}: {event['event']} "
+                    f"(alarm: {event['alarm_id']})"
                     for event in events
                 )
             else:
@@ -511,13 +547,12 @@ class OptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
         if not phone:
             return self.async_abort(reason="phone_not_found")
 
-        qr_code = generate_qr_code_data_url(SHORTCUT_SYNC_URL)
         return self.async_show_form(
             step_id="sync_shortcut",
             description_placeholders={
                 "phone_name": phone.phone_name,
                 "phone_id": phone.phone_id,
-                "qr_code": qr_code,
+                "qr_code": qr_code_url(self.hass, QR_CODE_SYNC),
                 "shortcut_url": SHORTCUT_SYNC_URL,
             },
         )
@@ -541,17 +576,14 @@ class OptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
             "\n".join(alarms_list) if alarms_list else "No alarms synchronized yet."
         )
 
-        alarm_event_qr_code = generate_qr_code_data_url(SHORTCUT_ALARM_EVENT_URL)
-        device_event_qr_code = generate_qr_code_data_url(SHORTCUT_DEVICE_EVENT_URL)
-
         return self.async_show_form(
             step_id="event_shortcuts",
             description_placeholders={
                 "phone_id": phone.phone_id,
                 "alarms_list": alarms_text,
-                "alarm_event_qr_code": alarm_event_qr_code,
+                "alarm_event_qr_code": qr_code_url(self.hass, QR_CODE_ALARM_EVENT),
                 "alarm_event_shortcut_url": SHORTCUT_ALARM_EVENT_URL,
-                "device_event_qr_code": device_event_qr_code,
+                "device_event_qr_code": qr_code_url(self.hass, QR_CODE_DEVICE_EVENT),
                 "device_event_shortcut_url": SHORTCUT_DEVICE_EVENT_URL,
             },
         )
@@ -17,8 +17,10 @@ CONF_ALLOWS_SNOOZE = "allows_snooze"
 CONF_SNOOZE_TIME = "snooze_time"
 CONF_SYNCED_AT = "synced_at"
 CONF_EVENT = "event"
+CONF_EVENTS = "events"
 CONF_EVENT_TYPE = "event_type"
 CONF_EVENT_ID = "event_id"
+CONF_EVENT_KEY = "event_key"
 CONF_OCCURRED_AT = "occurred_at"
 CONF_LAST_SYNC = "last_sync"
 CONF_LAST_EVENT_GOES_OFF_AT = "last_event_goes_off_at"
@@ -42,6 +44,15 @@ CONF_ANY_LAST_EVENT_STOPPED_AT = "any_last_event_stopped_at"
 CONF_BEDTIME_LAST_EVENT_AT = "bedtime_last_event_at"
 CONF_WAKING_UP_LAST_EVENT_AT = "waking_up_last_event_at"
 CONF_WIND_DOWN_LAST_EVENT_AT = "wind_down_last_event_at"
+CONF_SAVE_DELAY = "save_delay"
+CONF_SYNC_COALESCE_WINDOW = "sync_coalesce_window"
+CONF_SYNC_RATE_LIMIT = "sync_rate_limit"
+CONF_START = "start"
+CONF_END = "end"
+CONF_LIMIT = "limit"
+CONF_CURSOR = "cursor"
+CONF_FINGERPRINT = "fingerprint"
+CONF_SYNC_FINGERPRINT = "sync_fingerprint"
 
 EVENT_ALARM_EVENT = "iphone_alarms_sync_alarm_event"
 
@@ -54,9 +65,33 @@ EVENT_WIND_DOWN_STARTS = "wind_down_starts"
 
 DEFAULT_ICON = "mdi:alarm"
 DEFAULT_SNOOZE_TIME = 9
+DEFAULT_SAVE_DELAY = 10
+MAX_SAVE_DELAY = 300
+DEFAULT_SYNC_COALESCE_WINDOW = 2
+DEFAULT_SYNC_RATE_LIMIT = 12
+MAX_SYNC_COALESCE_WINDOW = 60
+MAX_SYNC_RATE_LIMIT = 120
+SYNC_RATE_LIMIT_PERIOD = 60
+EVENT_KEY_CACHE_SIZE = 256
+EVENT_KEY_TTL = 3600
 
 PLATFORMS = ["binary_sensor", "number", "sensor"]
 
+DATA_COORDINATORS = "coordinators"
+DATA_HISTORY = "history"
+DATA_QR_CODE_URLS = "qr_code_urls"
+
+SIGNAL_ALARM_ADDED = f"{DOMAIN}_alarm_added_{{entry_id}}"
+SIGNAL_EVENT_SENSOR_ADDED = f"{DOMAIN}_event_sensor_added_{{entry_id}}"
+
+HISTORY_DB_FILE = f"{DOMAIN}_history.db"
+HISTORY_MAX_EVENTS = 100000
+HISTORY_PRUNE_SLACK = 1000
+DEFAULT_QUERY_LIMIT = 100
+MAX_QUERY_LIMIT = 1000
+DEFAULT_SCHEDULE_LIMIT = 5
+MAX_SCHEDULE_LIMIT = 50
+
 SHORTCUT_SYNC_URL = "https://www.icloud.com/shortcuts/6789fb4017904ef1aa6dda8d9c89eaa8"
 SHORTCUT_ALARM_EVENT_URL = (
     "https://www.icloud.com/shortcuts/5112bf576239414f91d626b10dd9f2e2"
@@ -66,3 +101,16 @@ SHORTCUT_DEVICE_EVENT_URL = (
 )
 
 SHORTCUT_ICLOUD_URL = SHORTCUT_SYNC_URL
+
+QR_CODE_SYNC = "sync"
+QR_CODE_ALARM_EVENT = "alarm_event"
+QR_CODE_DEVICE_EVENT = "device_event"
+SHORTCUT_QR_CODES = {
+    QR_CODE_SYNC: SHORTCUT_SYNC_URL,
+    QR_CODE_ALARM_EVENT: SHORTCUT_ALARM_EVENT_URL,
+    QR_CODE_DEVICE_EVENT: SHORTCUT_DEVICE_EVENT_URL,
+}
+QR_CODE_VIEW_URL = f"/api/{DOMAIN}/qr/{{name}}"
+QR_CODE_MAX_AGE = 86400
+QR_CODE_URL_EXPIRATION = 86400
+QR_CODE_URL_RENEW_BEFORE = 3600
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import sys
+import time
 import uuid
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any
-
-from homeassistant.core import HomeAssistant
+from datetime import datetime, timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from homeassistant.const import EVENT_CORE_CONFIG_UPDATE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_point_in_utc_time,
+)
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.util import dt as dt_util
 
@@ -13,8 +22,10 @@ if TYPE_CHECKING:
 else:
     ConfigEntry = Any
 
+from .admission import SyncAdmission
 from .const import (
     CONF_ALARM_ID,
+    CONF_ALARMS,
     CONF_ALLOWS_SNOOZE,
     CONF_ANY_LAST_EVENT_GOES_OFF_AT,
     CONF_ANY_LAST_EVENT_SNOOZED_AT,
@@ -36,23 +47,55 @@ from .const import (
     CONF_PHONE_NAME,
     CONF_REPEAT_DAYS,
     CONF_REPEATS,
+    CONF_SAVE_DELAY,
     CONF_SNOOZE_TIME,
+    CONF_SYNC_COALESCE_WINDOW,
     CONF_SYNC_DISABLED_ALARMS,
+    CONF_SYNC_FINGERPRINT,
+    CONF_SYNC_RATE_LIMIT,
     CONF_SYNCED_AT,
     CONF_WAKEUP_LAST_EVENT_GOES_OFF_AT,
     CONF_WAKEUP_LAST_EVENT_SNOOZED_AT,
     CONF_WAKEUP_LAST_EVENT_STOPPED_AT,
     CONF_WAKING_UP_LAST_EVENT_AT,
     CONF_WIND_DOWN_LAST_EVENT_AT,
+    DEFAULT_SAVE_DELAY,
     DEFAULT_SNOOZE_TIME,
-    EVENT_GOES_OFF,
-    EVENT_SNOOZED,
-    EVENT_STOPPED,
+    DEFAULT_SYNC_COALESCE_WINDOW,
+    DEFAULT_SYNC_RATE_LIMIT,
+    EVENT_KEY_CACHE_SIZE,
+    EVENT_KEY_TTL,
+)
+from .events import EventKind
+from .history import EventHistory
+from .schedule import AlarmSchedule
+from .storage import create_store
+from .utils import (
+    extract_alarm_uuid,
+    format_timestamp,
+    parse_timestamp,
+    parse_weekdays,
+    weekday_names,
 )
-from .utils import extract_alarm_uuid
 
+ALARM_SCHEDULE_FIELDS = ("next_occurrence_datetime", "last_occurrence_datetime")
+PHONE_SCHEDULE_FIELDS = (
+    "next_alarm_datetime",
+    "next_alarm_label",
+    "last_alarm_datetime",
+)
+PHONE_SYNC_FIELDS = (
+    "last_sync",
+    "enabled_alarms",
+    "total_alarms",
+    "disabled_alarms",
+    "next_alarm_datetime",
+    "next_alarm_label",
+)
+SYNC_ADMISSION_FIELDS = ("sync_calls_merged", "sync_calls_dropped")
 
-@dataclass
+
+@dataclass(slots=True)
 class AlarmData:
     alarm_id: str
     label: str
@@ -60,44 +103,60 @@ class AlarmData:
     hour: int
     minute: int
     repeats: bool
-    repeat_days: list[str]
+    repeat_days: int
     allows_snooze: bool
     snooze_time: int = DEFAULT_SNOOZE_TIME
-    last_event_goes_off_at: str | None = None
-    last_event_snoozed_at: str | None = None
-    last_event_stopped_at: str | None = None
-    last_occurrence_datetime: str | None = None
+    last_event_goes_off_at: datetime | None = None
+    last_event_snoozed_at: datetime | None = None
+    last_event_stopped_at: datetime | None = None
+    last_occurrence_datetime: datetime | None = None
     icon: str = "mdi:alarm"
+    unknown_repeat_days: tuple[str, ...] = ()
 
 
-@dataclass
-class AlarmEvent:
-    event_id: str
+class AlarmEvent(NamedTuple):
+    event_uuid: int
     alarm_id: str
-    phone_id: str
     event: str
-    occurred_at: str
+    occurred_at: datetime
 
+    @property
+    def event_id(self) -> str:
+        return str(uuid.UUID(int=self.event_uuid))
 
-@dataclass
+
+@dataclass(slots=True)
 class PhoneData:
     phone_id: str
     phone_name: str
     mobile_app_device_id: str | None
     alarms: dict[str, AlarmData]
-    synced_at: str | None = None
+    synced_at: datetime | None = None
     sync_disabled_alarms: bool = True
-    last_alarm_datetime: str | None = None
+    last_alarm_datetime: datetime | None = None
     last_alarm_id: str | None = None
-    wakeup_last_event_goes_off_at: str | None = None
-    wakeup_last_event_snoozed_at: str | None = None
-    wakeup_last_event_stopped_at: str | None = None
-    any_last_event_goes_off_at: str | None = None
-    any_last_event_snoozed_at: str | None = None
-    any_last_event_stopped_at: str | None = None
-    bedtime_last_event_at: str | None = None
-    waking_up_last_event_at: str | None = None
-    wind_down_last_event_at: str | None = None
+    wakeup_last_event_goes_off_at: datetime | None = None
+    wakeup_last_event_snoozed_at: datetime | None = None
+    wakeup_last_event_stopped_at: datetime | None = None
+    any_last_event_goes_off_at: datetime | None = None
+    any_last_event_snoozed_at: datetime | None = None
+    any_last_event_stopped_at: datetime | None = None
+    bedtime_last_event_at: datetime | None = None
+    waking_up_last_event_at: datetime | None = None
+    wind_down_last_event_at: datetime | None = None
+    sync_fingerprint: str | None = None
+
+
+@dataclass
+class SyncResult:
+    added: list[str]
+    updated: list[str]
+    removed: list[str]
+    relabeled: list[str]
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
 
 
 @dataclass
@@ -112,7 +171,9 @@ else:
 
 
 class IPhoneAlarmsSyncCoordinator(DataUpdateCoordinator[PhoneData]):
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, history: EventHistory
+    ) -> None:
         super().__init__(
             hass,
             logger=__import__("logging").getLogger(__name__),
@@ -121,21 +182,55 @@ class IPhoneAlarmsSyncCoordinator(DataUpdateCoordinator[PhoneData]):
         )
         self.entry = entry
         self._phone: PhoneData | None = None
-        self._events: list[AlarmEvent] = []
-        self._load_from_config()
-
-    def _load_from_config(self) -> None:
+        self.phone_device_id: str | None = None
+        self.phone_device_via_id: str | None = None
+        self.alarm_device_ids: dict[str, str] = {}
+        self._schedule: AlarmSchedule | None = None
+        self._field_listeners: dict[str | None, dict[str, list[CALLBACK_TYPE]]] = {}
+        self._unsub_scheduler: CALLBACK_TYPE | None = None
+        self._scheduled_at: datetime | None = None
+        self._scheduled_alarm_ids: list[str] = []
+        self._scheduler_started = False
+        self._unsub_time_zone: CALLBACK_TYPE | None = None
+        self._next_occurrences: dict[str, datetime | None] = {}
+        self._next_alarm: tuple[datetime | None, str | None] | None = None
+        self._cache_expires_at: datetime | None = None
+        self._history = history
+        self.sync_admission = SyncAdmission(
+            hass,
+            entry.data.get(CONF_SYNC_COALESCE_WINDOW, DEFAULT_SYNC_COALESCE_WINDOW),
+            entry.data.get(CONF_SYNC_RATE_LIMIT, DEFAULT_SYNC_RATE_LIMIT),
+            partial(self.async_publish, None, *SYNC_ADMISSION_FIELDS),
+        )
+        self._seen_event_keys: dict[str, float] = {}
+        self._entity_keys: dict[str | None, set[str]] = {}
+        self._save_delay: float = entry.data.get(CONF_SAVE_DELAY, DEFAULT_SAVE_DELAY)
+        self._save_pending = False
+        self._unsub_save: CALLBACK_TYPE | None = None
+        self._store = create_store(hass, entry.entry_id)
+        self._runtime_save_pending = False
+
+    async def async_load(self) -> None:
+        runtime = await self._store.async_load() or {}
+        self._load_from_config(runtime)
+
+    def _load_from_config(self, runtime: dict[str, Any]) -> None:
         phone_id = self.entry.data.get(CONF_PHONE_ID, "")
         phone_name = self.entry.data.get(CONF_PHONE_NAME, "")
         mobile_app_device_id = self.entry.data.get(CONF_MOBILE_APP_DEVICE_ID)
         sync_disabled_alarms = self.entry.data.get(CONF_SYNC_DISABLED_ALARMS, True)
 
         alarms_data = self.entry.options.get("alarms", {})
+        runtime_alarms = runtime.get(CONF_ALARMS, {})
         alarms = {}
         for original_alarm_id, alarm_dict in alarms_data.items():
-            alarm_id = extract_alarm_uuid(original_alarm_id)
+            alarm_id = sys.intern(extract_alarm_uuid(original_alarm_id))
             stored_alarm_id = alarm_dict.get(CONF_ALARM_ID, original_alarm_id)
-            parsed_stored_id = extract_alarm_uuid(stored_alarm_id)
+            parsed_stored_id = sys.intern(extract_alarm_uuid(stored_alarm_id))
+            alarm_runtime = runtime_alarms.get(original_alarm_id, {})
+            repeat_days, unknown_repeat_days = parse_weekdays(
+                alarm_dict.get(CONF_REPEAT_DAYS, [])
+            )
             alarms[alarm_id] = AlarmData(
                 alarm_id=parsed_stored_id,
                 label=alarm_dict.get(CONF_LABEL, ""),
@@ -143,53 +238,64 @@ class IPhoneAlarmsSyncCoordinator(DataUpdateCoordinator[PhoneData]):
                 hour=alarm_dict.get(CONF_HOUR, 0),
                 minute=alarm_dict.get(CONF_MINUTE, 0),
                 repeats=alarm_dict.get(CONF_REPEATS, False),
-                repeat_days=alarm_dict.get(CONF_REPEAT_DAYS, []),
+                repeat_days=repeat_days,
                 allows_snooze=alarm_dict.get(CONF_ALLOWS_SNOOZE, False),
                 snooze_time=alarm_dict.get(CONF_SNOOZE_TIME, DEFAULT_SNOOZE_TIME),
-                last_event_goes_off_at=alarm_dict.get(CONF_LAST_EVENT_GOES_OFF_AT),
-                last_event_snoozed_at=alarm_dict.get(CONF_LAST_EVENT_SNOOZED_AT),
-                last_event_stopped_at=alarm_dict.get(CONF_LAST_EVENT_STOPPED_AT),
-                last_occurrence_datetime=alarm_dict.get(CONF_LAST_OCCURRENCE_DATETIME),
+                last_event_goes_off_at=parse_timestamp(
+                    alarm_runtime.get(CONF_LAST_EVENT_GOES_OFF_AT)
+                ),
+                last_event_snoozed_at=parse_timestamp(
+                    alarm_runtime.get(CONF_LAST_EVENT_SNOOZED_AT)
+                ),
+                last_event_stopped_at=parse_timestamp(
+                    alarm_runtime.get(CONF_LAST_EVENT_STOPPED_AT)
+                ),
+                last_occurrence_datetime=parse_timestamp(
+                    alarm_runtime.get(CONF_LAST_OCCURRENCE_DATETIME)
+                ),
                 icon=alarm_dict.get(CONF_ICON, "mdi:alarm"),
+                unknown_repeat_days=unknown_repeat_days,
             )
 
-        synced_at = self.entry.options.get(CONF_SYNCED_AT)
-
         self._phone = PhoneData(
             phone_id=phone_id,
             phone_name=phone_name,
             mobile_app_device_id=mobile_app_device_id,
             alarms=alarms,
-            synced_at=synced_at,
+            synced_at=parse_timestamp(runtime.get(CONF_SYNCED_AT)),
             sync_disabled_alarms=sync_disabled_alarms,
-            last_alarm_datetime=self.entry.options.get(CONF_LAST_ALARM_DATETIME),
-            last_alarm_id=self.entry.options.get(CONF_LAST_ALARM_ID),
-            wakeup_last_event_goes_off_at=self.entry.options.get(
-                CONF_WAKEUP_LAST_EVENT_GOES_OFF_AT
+            last_alarm_datetime=parse_timestamp(runtime.get(CONF_LAST_ALARM_DATETIME)),
+            last_alarm_id=runtime.get(CONF_LAST_ALARM_ID),
+            wakeup_last_event_goes_off_at=parse_timestamp(
+                runtime.get(CONF_WAKEUP_LAST_EVENT_GOES_OFF_AT)
+            ),
+            wakeup_last_event_snoozed_at=parse_timestamp(
+                runtime.get(CONF_WAKEUP_LAST_EVENT_SNOOZED_AT)
             ),
-            wakeup_last_event_snoozed_at=self.entry.options.get(
-                CONF_WAKEUP_LAST_EVENT_SNOOZED_AT
+            wakeup_last_event_stopped_at=parse_timestamp(
+                runtime.get(CONF_WAKEUP_LAST_EVENT_STOPPED_AT)
             ),
-            wakeup_last_event_stopped_at=self.entry.options.get(
-                CONF_WAKEUP_LAST_EVENT_STOPPED_AT
+            any_last_event_goes_off_at=parse_timestamp(
+                runtime.get(CONF_ANY_LAST_EVENT_GOES_OFF_AT)
             ),
-            any_last_event_goes_off_at=self.entry.options.get(
-                CONF_ANY_LAST_EVENT_GOES_OFF_AT
+            any_last_event_snoozed_at=parse_timestamp(
+                runtime.get(CONF_ANY_LAST_EVENT_SNOOZED_AT)
             ),
-            any_last_event_snoozed_at=self.entry.options.get(
-                CONF_ANY_LAST_EVENT_SNOOZED_AT
+            any_last_event_stopped_at=parse_timestamp(
+                runtime.get(CONF_ANY_LAST_EVENT_STOPPED_AT)
             ),
-            any_last_event_stopped_at=self.entry.options.get(
-                CONF_ANY_LAST_EVENT_STOPPED_AT
+            bedtime_last_event_at=parse_timestamp(
+                runtime.get(CONF_BEDTIME_LAST_EVENT_AT)
             ),
-            bedtime_last_event_at=self.entry.options.get(CONF_BEDTIME_LAST_EVENT_AT),
-            waking_up_last_event_at=self.entry.options.get(
-                CONF_WAKING_UP_LAST_EVENT_AT
+            waking_up_last_event_at=parse_timestamp(
+                runtime.get(CONF_WAKING_UP_LAST_EVENT_AT)
             ),
-            wind_down_last_event_at=self.entry.options.get(
-                CONF_WIND_DOWN_LAST_EVENT_AT
+            wind_down_last_event_at=parse_timestamp(
+                runtime.get(CONF_WIND_DOWN_LAST_EVENT_AT)
             ),
+            sync_fingerprint=runtime.get(CONF_SYNC_FINGERPRINT),
         )
+        self._schedule = AlarmSchedule(self._phone)
 
     async def _async_update_data(self) -> PhoneData:
         if self._phone is None:
@@ -208,9 +314,12 @@ class IPhoneAlarmsSyncCoordinator(DataUpdateCoordinator[PhoneData]):
             self._phone.phone_name = phone_name
         if mobile_app_device_id is not None:
             self._phone.mobile_app_device_id = mobile_app_device_id
-        if sync_disabled_alarms is not None:
+        if (
+            sync_disabled_alarms is not None
+            and sync_disabled_alarms != self._phone.sync_disabled_alarms
+        ):
             self._phone.sync_disabled_alarms = sync_disabled_alarms
-        self._save_to_config()
+            self._invalidate_sync_fingerprint()
 
     def get_phone(self) -> PhoneData | None:
         return self._phone
@@ -231,26 +340,45 @@ class IPhoneAlarmsSyncCoordinator(DataUpdateCoordinator[PhoneData]):
             or existing.hour != new_dict.get(CONF_HOUR)
             or existing.minute != new_dict.get(CONF_MINUTE)
             or existing.repeats != new_dict.get(CONF_REPEATS)
-            or existing.repeat_days != new_dict.get(CONF_REPEAT_DAYS, [])
+            or (existing.repeat_days, existing.unknown_repeat_days)
+            != parse_weekdays(new_dict.get(CONF_REPEAT_DAYS, []))
             or existing.allows_snooze != new_dict.get(CONF_ALLOWS_SNOOZE)
         )
 
-    def sync_alarms(self, alarms: list[dict[str, Any]]) -> tuple[list[str], bool]:
+    def is_in_sync(self, fingerprint: str | None) -> bool:
+        if self._phone is None or fingerprint is None:
+            return False
+        return self._phone.sync_fingerprint == fingerprint
+
+    def _invalidate_sync_fingerprint(self) -> None:
+        if self._phone is None or self._phone.sync_fingerprint is None:
+            return
+        self._phone.sync_fingerprint = None
+        self.async_schedule_runtime_save()
+
+    def sync_alarms(
+        self, alarms: list[dict[str, Any]], fingerprint: str | None = None
+    ) -> SyncResult:
         if self._phone is None:
             raise ValueError("Phone not initialized")
+        if fingerprint is not None and fingerprint != self._phone.sync_fingerprint:
+            self._phone.sync_fingerprint = fingerprint
+            self.async_schedule_runtime_save()
 
-        has_changes = False
-        synced_at = dt_util.utcnow().isoformat()
-        new_alarm_ids: list[str] = []
+        synced_at = dt_util.utcnow()
+        result = SyncResult(added=[], updated=[], removed=[], relabeled=[])
 
         if not self._phone.sync_disabled_alarms:
             alarms = [a for a in alarms if a.get(CONF_ENABLED, False)]
 
         synced_alarm_ids = set()
         for alarm_dict in alarms:
-            alarm_id = alarm_dict[CONF_ALARM_ID]
+            alarm_id = sys.intern(alarm_dict[CONF_ALARM_ID])
             synced_alarm_ids.add(alarm_id)
             if alarm_id not in self._phone.alarms:
+                repeat_days, unknown_repeat_days = parse_weekdays(
+                    alarm_dict.get(CONF_REPEAT_DAYS, [])
+                )
                 self._phone.alarms[alarm_id] = AlarmData(
                     alarm_id=alarm_id,
                     label=alarm_dict.get(CONF_LABEL, ""),
@@ -258,27 +386,30 @@ class IPhoneAlarmsSyncCoordinator(DataUpdateCoordinator[PhoneData]):
                     hour=alarm_dict.get(CONF_HOUR, 0),
                     minute=alarm_dict.get(CONF_MINUTE, 0),
                     repeats=alarm_dict.get(CONF_REPEATS, False),
-                    repeat_days=alarm_dict.get(CONF_REPEAT_DAYS, []),
+                    repeat_days=repeat_days,
                     allows_snooze=alarm_dict.get(CONF_ALLOWS_SNOOZE, False),
                     snooze_time=alarm_dict.get(CONF_SNOOZE_TIME, DEFAULT_SNOOZE_TIME),
+                    unknown_repeat_days=unknown_repeat_days,
                 )
-                new_alarm_ids.append(alarm_id)
-                has_changes = True
+                result.added.append(alarm_id)
             else:
                 alarm = self._phone.alarms[alarm_id]
                 if self._alarm_data_changed(alarm, alarm_dict):
+                    if alarm.label != alarm_dict.get(CONF_LABEL, alarm.label):
+                        result.relabeled.append(alarm_id)
                     alarm.label = alarm_dict.get(CONF_LABEL, alarm.label)
                     alarm.enabled = alarm_dict.get(CONF_ENABLED, alarm.enabled)
                     alarm.hour = alarm_dict.get(CONF_HOUR, alarm.hour)
                     alarm.minute = alarm_dict.get(CONF_MINUTE, alarm.minute)
                     alarm.repeats = alarm_dict.get(CONF_REPEATS, alarm.repeats)
-                    alarm.repeat_days = alarm_dict.get(
-                        CONF_REPEAT_DAYS, alarm.repeat_days
-                    )
+                    if CONF_REPEAT_DAYS in alarm_dict:
+                        alarm.repeat_days, alarm.unknown_repeat_days = parse_weekdays(
+                            alarm_dict[CONF_REPEAT_DAYS]
+                        )
                     alarm.allows_snooze = alarm_dict.get(
                         CONF_ALLOWS_SNOOZE, alarm.allows_snooze
                     )
-                    has_changes = True
+                    result.updated.append(alarm_id)
 
         if not self._phone.sync_disabled_alarms:
             alarms_to_remove = [
@@ -288,126 +419,210 @@ class IPhoneAlarmsSyncCoordinator(DataUpdateCoordinator[PhoneData]):
             ]
             for alarm_id in alarms_to_remove:
                 del self._phone.alarms[alarm_id]
-                has_changes = True
+                self._entity_keys.pop(alarm_id, None)
+                result.removed.append(alarm_id)
 
-        if has_changes:
+        if result.has_changes:
             self._phone.synced_at = synced_at
-            self._save_to_config()
+            self._rebuild_schedule()
+            self.async_schedule_save()
+            self.async_schedule_runtime_save()
 
-        return new_alarm_ids, has_changes
+        return result
 
-    def report_alarm_event(self, alarm_id: str, event: str) -> AlarmEvent:
+    def report_event(
+        self,
+        kind: EventKind,
+        alarm_id: str | None = None,
+        occurred_at: datetime | None = None,
+    ) -> AlarmEvent:
         if self._phone is None:
             raise ValueError("Phone not initialized")
-        if alarm_id not in self._phone.alarms:
-            raise ValueError(f"Alarm {alarm_id} not found")
+        target: AlarmData | PhoneData
+        if kind.source is None:
+            if alarm_id not in self._phone.alarms:
+                raise ValueError(f"Alarm {alarm_id} not found")
+            target = self._phone.alarms[alarm_id]
+            source = target.alarm_id
+        else:
+            target = self._phone
+            source = kind.source
         event_obj = AlarmEvent(
-            event_id=str(uuid.uuid4()),
-            alarm_id=alarm_id,
-            phone_id=self._phone.phone_id,
-            event=event,
-            occurred_at=dt_util.utcnow().isoformat(),
+            event_uuid=uuid.uuid4().int,
+            alarm_id=source,
+            event=kind.event,
+            occurred_at=occurred_at or dt_util.utcnow(),
         )
-        self._events.append(event_obj)
-        alarm = self._phone.alarms[alarm_id]
-        if event == EVENT_GOES_OFF:
-            alarm.last_event_goes_off_at = event_obj.occurred_at
-        elif event == EVENT_SNOOZED:
-            alarm.last_event_snoozed_at = event_obj.occurred_at
-        elif event == EVENT_STOPPED:
-            alarm.last_event_stopped_at = event_obj.occurred_at
-        self._save_to_config()
+        self._record_event(self._phone.phone_id, event_obj)
+        last_at = getattr(target, kind.field)
+        if last_at is None or event_obj.occurred_at > last_at:
+            setattr(target, kind.field, event_obj.occurred_at)
+            self.async_schedule_runtime_save()
         return event_obj
 
-    def report_wakeup_event(self, event: str) -> AlarmEvent:
-        if self._phone is None:
-            raise ValueError("Phone not initialized")
-        event_obj = AlarmEvent(
-            event_id=str(uuid.uuid4()),
-            alarm_id="wakeup",
-            phone_id=self._phone.phone_id,
-            event=event,
-            occurred_at=dt_util.utcnow().isoformat(),
-        )
-        self._events.append(event_obj)
-        if event == EVENT_GOES_OFF:
-            self._phone.wakeup_last_event_goes_off_at = event_obj.occurred_at
-        elif event == EVENT_SNOOZED:
-            self._phone.wakeup_last_event_snoozed_at = event_obj.occurred_at
-        elif event == EVENT_STOPPED:
-            self._phone.wakeup_last_event_stopped_at = event_obj.occurred_at
-        self._save_to_config()
-        return event_obj
+    def claim_event_key(self, event_key: str) -> bool:
+        now = time.monotonic()
+        seen = self._seen_event_keys
+        while seen and next(iter(seen.values())) <= now:
+            del seen[next(iter(seen))]
+        if event_key in seen:
+            return False
+        seen[event_key] = now + EVENT_KEY_TTL
+        if len(seen) > EVENT_KEY_CACHE_SIZE:
+            del seen[next(iter(seen))]
+        return True
+
+    def claim_entity_key(self, alarm_id: str | None, key: str) -> bool:
+        keys = self._entity_keys.setdefault(alarm_id, set())
+        if key in keys:
+            return False
+        keys.add(key)
+        return True
+
+    def _record_event(self, phone_id: str, event_obj: AlarmEvent) -> None:
+        self._history.async_append(phone_id, event_obj)
 
-    def report_any_event(self, event: str) -> AlarmEvent:
+    def get_alarm(self, alarm_id: str) -> AlarmData | None:
         if self._phone is None:
-            raise ValueError("Phone not initialized")
-        event_obj = AlarmEvent(
-            event_id=str(uuid.uuid4()),
-            alarm_id="any",
-            phone_id=self._phone.phone_id,
-            event=event,
-            occurred_at=dt_util.utcnow().isoformat(),
-        )
-        self._events.append(event_obj)
-        if event == EVENT_GOES_OFF:
-            self._phone.any_last_event_goes_off_at = event_obj.occurred_at
-        elif event == EVENT_SNOOZED:
-            self._phone.any_last_event_snoozed_at = event_obj.occurred_at
-        elif event == EVENT_STOPPED:
-            self._phone.any_last_event_stopped_at = event_obj.occurred_at
-        self._save_to_config()
-        return event_obj
+            return None
+        return self._phone.alarms.get(alarm_id)
 
-    def report_bedtime_event(self) -> AlarmEvent:
-        if self._phone is None:
-            raise ValueError("Phone not initialized")
-        event_obj = AlarmEvent(
-            event_id=str(uuid.uuid4()),
-            alarm_id="bedtime",
-            phone_id=self._phone.phone_id,
-            event="bedtime_starts",
-            occurred_at=dt_util.utcnow().isoformat(),
+    def get_next_occurrence(self, alarm_id: str) -> datetime | None:
+        if self._schedule is None:
+            return None
+        self._expire_schedule_cache()
+        if alarm_id not in self._next_occurrences:
+            self._next_occurrences[alarm_id] = self._schedule.next_occurrence(alarm_id)
+        return self._next_occurrences[alarm_id]
+
+    def get_next_alarm(self) -> tuple[datetime | None, str | None]:
+        if self._schedule is None:
+            return None, None
+        self._expire_schedule_cache()
+        if self._next_alarm is None:
+            self._next_alarm = self._schedule.next_alarm()
+        return self._next_alarm
+
+    def get_upcoming_alarms(self, count: int) -> list[tuple[datetime, str]]:
+        if self._schedule is None:
+            return []
+        return self._schedule.upcoming(count)
+
+    def _expire_schedule_cache(self) -> None:
+        now = dt_util.utcnow()
+        if self._cache_expires_at is not None and now < self._cache_expires_at:
+            return
+        self._next_occurrences.clear()
+        self._next_alarm = None
+        next_midnight = dt_util.start_of_local_day(
+            dt_util.as_local(now).date() + timedelta(days=1)
         )
-        self._events.append(event_obj)
-        self._phone.bedtime_last_event_at = event_obj.occurred_at
-        self._save_to_config()
-        return event_obj
+        next_due = self._schedule.next_due(now)[0] if self._schedule else None
+        self._cache_expires_at = min(filter(None, (next_due, next_midnight)))
 
-    def report_waking_up_event(self) -> AlarmEvent:
-        if self._phone is None:
-            raise ValueError("Phone not initialized")
-        event_obj = AlarmEvent(
-            event_id=str(uuid.uuid4()),
-            alarm_id="waking_up",
-            phone_id=self._phone.phone_id,
-            event="waking_up",
-            occurred_at=dt_util.utcnow().isoformat(),
-        )
-        self._events.append(event_obj)
-        self._phone.waking_up_last_event_at = event_obj.occurred_at
-        self._save_to_config()
-        return event_obj
+    def _invalidate_schedule_cache(self) -> None:
+        self._cache_expires_at = None
 
-    def report_wind_down_event(self) -> AlarmEvent:
+    def _rebuild_schedule(self) -> None:
         if self._phone is None:
-            raise ValueError("Phone not initialized")
-        event_obj = AlarmEvent(
-            event_id=str(uuid.uuid4()),
-            alarm_id="wind_down",
-            phone_id=self._phone.phone_id,
-            event="wind_down_starts",
-            occurred_at=dt_util.utcnow().isoformat(),
+            return
+        self._schedule = AlarmSchedule(self._phone)
+        self._invalidate_schedule_cache()
+        if self._scheduler_started:
+            self._async_arm_scheduler()
+
+    @callback
+    def async_add_field_listener(
+        self, update_callback: CALLBACK_TYPE, alarm_id: str | None, field: str
+    ) -> CALLBACK_TYPE:
+        fields = self._field_listeners.setdefault(alarm_id, {})
+        listeners = fields.setdefault(field, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(update_callback)
+            if not listeners:
+                del fields[field]
+            if not fields:
+                self._field_listeners.pop(alarm_id, None)
+
+        return remove_listener
+
+    @callback
+    def async_publish(self, alarm_id: str | None, *fields: str) -> None:
+        alarm_listeners = self._field_listeners.get(alarm_id)
+        if not alarm_listeners:
+            return
+        for field in fields or list(alarm_listeners):
+            for update_callback in list(alarm_listeners.get(field, ())):
+                update_callback()
+
+    @callback
+    def async_start_scheduler(self) -> None:
+        self._scheduler_started = True
+        self._unsub_time_zone = self.hass.bus.async_listen(
+            EVENT_CORE_CONFIG_UPDATE, self._async_handle_core_config_update
+        )
+        self._async_arm_scheduler()
+
+    @callback
+    def async_stop_scheduler(self) -> None:
+        self._scheduler_started = False
+        if self._unsub_time_zone is not None:
+            self._unsub_time_zone()
+            self._unsub_time_zone = None
+        if self._unsub_scheduler is not None:
+            self._unsub_scheduler()
+            self._unsub_scheduler = None
+
+    @callback
+    def _async_handle_core_config_update(self, event: Event) -> None:
+        if "time_zone" not in event.data:
+            return
+        self._invalidate_schedule_cache()
+        self._async_arm_scheduler()
+        for alarm_id in list(self._field_listeners):
+            if alarm_id is None:
+                self.async_publish(None, *PHONE_SCHEDULE_FIELDS)
+            else:
+                self.async_publish(alarm_id, *ALARM_SCHEDULE_FIELDS)
+
+    @callback
+    def _async_arm_scheduler(self, now: datetime | None = None) -> None:
+        if self._unsub_scheduler is not None:
+            self._unsub_scheduler()
+            self._unsub_scheduler = None
+        if self._schedule is None:
+            return
+        self._scheduled_at, self._scheduled_alarm_ids = self._schedule.next_due(now)
+        if self._scheduled_at is None:
+            return
+        self._unsub_scheduler = async_track_point_in_utc_time(
+            self.hass, self._async_handle_alarms_due, self._scheduled_at
         )
-        self._events.append(event_obj)
-        self._phone.wind_down_last_event_at = event_obj.occurred_at
-        self._save_to_config()
-        return event_obj
 
-    def get_alarm(self, alarm_id: str) -> AlarmData | None:
-        if self._phone is None:
-            return None
-        return self._phone.alarms.get(alarm_id)
+    @callback
+    def _async_handle_alarms_due(self, _now: datetime) -> None:
+        self._unsub_scheduler = None
+        fire_at = self._scheduled_at
+        if self._phone is None or fire_at is None:
+            return
+        due_alarm_ids = [
+            alarm_id
+            for alarm_id in self._scheduled_alarm_ids
+            if alarm_id in self._phone.alarms
+        ]
+        for alarm_id in due_alarm_ids:
+            self._phone.alarms[alarm_id].last_occurrence_datetime = fire_at
+        if due_alarm_ids:
+            self._phone.last_alarm_datetime = fire_at
+            self._phone.last_alarm_id = self._phone.alarms[due_alarm_ids[0]].alarm_id
+            self.async_schedule_runtime_save()
+        for alarm_id in due_alarm_ids:
+            self.async_publish(alarm_id, *ALARM_SCHEDULE_FIELDS)
+        self.async_publish(None, *PHONE_SCHEDULE_FIELDS)
+        self._async_arm_scheduler(fire_at)
 
     def get_all_alarms(self) -> dict[str, AlarmData]:
         if self._phone is None:
@@ -419,7 +634,11 @@ class IPhoneAlarmsSyncCoordinator(DataUpdateCoordinator[PhoneData]):
             raise ValueError("Phone not initialized")
         if alarm_id in self._phone.alarms:
             del self._phone.alarms[alarm_id]
-            self._save_to_config()
+            self._entity_keys.pop(alarm_id, None)
+            self._rebuild_schedule()
+            self._phone.sync_fingerprint = None
+            self.async_schedule_save()
+            self.async_schedule_runtime_save()
 
     def update_alarm_metadata(
         self,
@@ -436,7 +655,8 @@ class IPhoneAlarmsSyncCoordinator(DataUpdateCoordinator[PhoneData]):
             alarm.label = label
         if icon is not None:
             alarm.icon = icon
-        self._save_to_config()
+        self._invalidate_sync_fingerprint()
+        self.async_schedule_save()
 
     def update_alarm_snooze_time(
         self,
@@ -449,28 +669,109 @@ class IPhoneAlarmsSyncCoordinator(DataUpdateCoordinator[PhoneData]):
             raise ValueError(f"Alarm {alarm_id} not found")
         alarm = self._phone.alarms[alarm_id]
         alarm.snooze_time = snooze_time
+        self.async_schedule_save()
+
+    async def async_get_history(self, limit: int) -> list[dict[str, Any]]:
+        if self._phone is None:
+            return []
+        return await self._history.async_recent(self._phone.phone_id, limit)
+
+    @callback
+    def async_schedule_save(self) -> None:
+        self._save_pending = True
+        if self._unsub_save is None:
+            self._unsub_save = async_call_later(
+                self.hass, self._save_delay, self._async_handle_save_timer
+            )
+
+    @callback
+    def async_schedule_runtime_save(self) -> None:
+        self._runtime_save_pending = True
+        self._store.async_delay_save(self._runtime_data_to_save, self._save_delay)
+
+    @callback
+    def _async_handle_save_timer(self, _now: datetime) -> None:
+        self._unsub_save = None
+        self._async_flush_config()
+
+    @callback
+    def _async_flush_config(self) -> None:
+        if self._unsub_save is not None:
+            self._unsub_save()
+            self._unsub_save = None
+        if not self._save_pending:
+            return
+        self._save_pending = False
         self._save_to_config()
 
-    def get_events(
-        self,
-        alarm_id: str | None = None,
-        limit: int | None = None,
-    ) -> list[AlarmEvent]:
-        events = self._events
-        if alarm_id:
-            events = [e for e in events if e.alarm_id == alarm_id]
-        if limit:
-            events = events[-limit:]
-        return events
+    async def async_flush(self, _event: Event | None = None) -> None:
+        self._async_flush_config()
+        if not self._runtime_save_pending:
+            return
+        await self._store.async_save(self._runtime_data_to_save())
+
+    def _runtime_data_to_save(self) -> dict[str, Any]:
+        self._runtime_save_pending = False
+        if self._phone is None:
+            return {}
+        return {
+            CONF_SYNCED_AT: format_timestamp(self._phone.synced_at),
+            CONF_LAST_ALARM_DATETIME: format_timestamp(self._phone.last_alarm_datetime),
+            CONF_LAST_ALARM_ID: self._phone.last_alarm_id,
+            CONF_WAKEUP_LAST_EVENT_GOES_OFF_AT: format_timestamp(
+                self._phone.wakeup_last_event_goes_off_at
+            ),
+            CONF_WAKEUP_LAST_EVENT_SNOOZED_AT: format_timestamp(
+                self._phone.wakeup_last_event_snoozed_at
+            ),
+            CONF_WAKEUP_LAST_EVENT_STOPPED_AT: format_timestamp(
+                self._phone.wakeup_last_event_stopped_at
+            ),
+            CONF_ANY_LAST_EVENT_GOES_OFF_AT: format_timestamp(
+                self._phone.any_last_event_goes_off_at
+            ),
+            CONF_ANY_LAST_EVENT_SNOOZED_AT: format_timestamp(
+                self._phone.any_last_event_snoozed_at
+            ),
+            CONF_ANY_LAST_EVENT_STOPPED_AT: format_timestamp(
+                self._phone.any_last_event_stopped_at
+            ),
+            CONF_BEDTIME_LAST_EVENT_AT: format_timestamp(
+                self._phone.bedtime_last_event_at
+            ),
+            CONF_WAKING_UP_LAST_EVENT_AT: format_timestamp(
+                self._phone.waking_up_last_event_at
+            ),
+            CONF_WIND_DOWN_LAST_EVENT_AT: format_timestamp(
+                self._phone.wind_down_last_event_at
+            ),
+            CONF_SYNC_FINGERPRINT: self._phone.sync_fingerprint,
+            CONF_ALARMS: {
+                alarm_id: {
+                    CONF_LAST_EVENT_GOES_OFF_AT: format_timestamp(
+                        alarm.last_event_goes_off_at
+                    ),
+                    CONF_LAST_EVENT_SNOOZED_AT: format_timestamp(
+                        alarm.last_event_snoozed_at
+                    ),
+                    CONF_LAST_EVENT_STOPPED_AT: format_timestamp(
+                        alarm.last_event_stopped_at
+                    ),
+                    CONF_LAST_OCCURRENCE_DATETIME: format_timestamp(
+                        alarm.last_occurrence_datetime
+                    ),
+                }
+                for alarm_id, alarm in self._phone.alarms.items()
+            },
+        }
 
     def _save_to_config(self) -> None:
         if self._phone is None:
             return
 
-        current_options = self.entry.options.copy()
-        current_alarms = current_options.get("alarms", {})
+        current_alarms = self.entry.options.get("alarms", {})
         alarms_dict = {}
-        has_changes = False
+        has_changes = current_alarms.keys() != self._phone.alarms.keys()
 
         for alarm_id, alarm in self._phone.alarms.items():
             alarm_data = {
@@ -480,105 +781,21 @@ class IPhoneAlarmsSyncCoordinator(DataUpdateCoordinator[PhoneData]):
                 CONF_HOUR: alarm.hour,
                 CONF_MINUTE: alarm.minute,
                 CONF_REPEATS: alarm.repeats,
-                CONF_REPEAT_DAYS: alarm.repeat_days,
+                CONF_REPEAT_DAYS: weekday_names(
+                    alarm.repeat_days, alarm.unknown_repeat_days
+                ),
                 CONF_ALLOWS_SNOOZE: alarm.allows_snooze,
                 CONF_SNOOZE_TIME: alarm.snooze_time,
-                CONF_LAST_EVENT_GOES_OFF_AT: alarm.last_event_goes_off_at,
-                CONF_LAST_EVENT_SNOOZED_AT: alarm.last_event_snoozed_at,
-                CONF_LAST_EVENT_STOPPED_AT: alarm.last_event_stopped_at,
-                CONF_LAST_OCCURRENCE_DATETIME: alarm.last_occurrence_datetime,
                 CONF_ICON: alarm.icon,
             }
 
-            if alarm_id not in current_alarms or current_alarms[alarm_id] != alarm_data:
+            if current_alarms.get(alarm_id) != alarm_data:
                 has_changes = True
 
             alarms_dict[alarm_id] = alarm_data
 
-        if current_alarms.keys() != alarms_dict.keys():
-            has_changes = True
-
-        if self._phone.synced_at != current_options.get(CONF_SYNCED_AT):
-            has_changes = True
-
-        if self._phone.last_alarm_datetime != current_options.get(
-            CONF_LAST_ALARM_DATETIME
-        ):
-            has_changes = True
-
-        if self._phone.last_alarm_id != current_options.get(CONF_LAST_ALARM_ID):
-            has_changes = True
-
-        if self._phone.wakeup_last_event_goes_off_at != current_options.get(
-            CONF_WAKEUP_LAST_EVENT_GOES_OFF_AT
-        ):
-            has_changes = True
-
-        if self._phone.wakeup_last_event_snoozed_at != current_options.get(
-            CONF_WAKEUP_LAST_EVENT_SNOOZED_AT
-        ):
-            has_changes = True
-
-        if self._phone.wakeup_last_event_stopped_at != current_options.get(
-            CONF_WAKEUP_LAST_EVENT_STOPPED_AT
-        ):
-            has_changes = True
-
-        if self._phone.any_last_event_goes_off_at != current_options.get(
-            CONF_ANY_LAST_EVENT_GOES_OFF_AT
-        ):
-            has_changes = True
-
-        if self._phone.any_last_event_snoozed_at != current_options.get(
-            CONF_ANY_LAST_EVENT_SNOOZED_AT
-        ):
-            has_changes = True
-
-        if self._phone.any_last_event_stopped_at != current_options.get(
-            CONF_ANY_LAST_EVENT_STOPPED_AT
-        ):
-            has_changes = True
-
-        if self._phone.bedtime_last_event_at != current_options.get(
-            CONF_BEDTIME_LAST_EVENT_AT
-        ):
-            has_changes = True
-
-        if self._phone.waking_up_last_event_at != current_options.get(
-            CONF_WAKING_UP_LAST_EVENT_AT
-        ):
-            has_changes = True
-
-        if self._phone.wind_down_last_event_at != current_options.get(
-            CONF_WIND_DOWN_LAST_EVENT_AT
-        ):
-            has_changes = True
-
         if has_changes:
-            new_options = {
-                "alarms": alarms_dict,
-                CONF_SYNCED_AT: self._phone.synced_at,
-                CONF_LAST_ALARM_DATETIME: self._phone.last_alarm_datetime,
-                CONF_LAST_ALARM_ID: self._phone.last_alarm_id,
-                CONF_WAKEUP_LAST_EVENT_GOES_OFF_AT: (
-                    self._phone.wakeup_last_event_goes_off_at
-                ),
-                CONF_WAKEUP_LAST_EVENT_SNOOZED_AT: (
-                    self._phone.wakeup_last_event_snoozed_at
-                ),
-                CONF_WAKEUP_LAST_EVENT_STOPPED_AT: (
-                    self._phone.wakeup_last_event_stopped_at
-                ),
-                CONF_ANY_LAST_EVENT_GOES_OFF_AT: (
-                    self._phone.any_last_event_goes_off_at
-                ),
-                CONF_ANY_LAST_EVENT_SNOOZED_AT: (self._phone.any_last_event_snoozed_at),
-                CONF_ANY_LAST_EVENT_STOPPED_AT: (self._phone.any_last_event_stopped_at),
-                CONF_BEDTIME_LAST_EVENT_AT: self._phone.bedtime_last_event_at,
-                CONF_WAKING_UP_LAST_EVENT_AT: self._phone.waking_up_last_event_at,
-                CONF_WIND_DOWN_LAST_EVENT_AT: self._phone.wind_down_last_event_at,
-            }
             self.hass.config_entries.async_update_entry(
                 self.entry,
-                options=new_options,
+                options={"alarms": alarms_dict},
             )
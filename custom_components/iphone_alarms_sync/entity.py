@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TypeVar
+
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import AlarmData, IPhoneAlarmsSyncCoordinator, PhoneData
+
+_T = TypeVar("_T")
+
+AlarmValueFn = Callable[[IPhoneAlarmsSyncCoordinator, str], _T | None]
+PhoneValueFn = Callable[[IPhoneAlarmsSyncCoordinator], _T | None]
+
+
+def alarm_value_fn(getter: Callable[[AlarmData], _T]) -> AlarmValueFn[_T]:
+    def value_fn(coordinator: IPhoneAlarmsSyncCoordinator, alarm_id: str) -> _T | None:
+        alarm = coordinator.get_alarm(alarm_id)
+        return getter(alarm) if alarm is not None else None
+
+    return value_fn
+
+
+def phone_value_fn(getter: Callable[[PhoneData], _T]) -> PhoneValueFn[_T]:
+    def value_fn(coordinator: IPhoneAlarmsSyncCoordinator) -> _T | None:
+        phone = coordinator.get_phone()
+        return getter(phone) if phone is not None else None
+
+    return value_fn
+
+
+class IPhoneAlarmsSyncEntity(CoordinatorEntity[IPhoneAlarmsSyncCoordinator]):
+    _alarm_id: str | None = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_field_listener(
+                self.async_write_ha_state, self._alarm_id, self.entity_description.key
+            )
+        )
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .const import (
+    CONF_ANY_LAST_EVENT_GOES_OFF_AT,
+    CONF_ANY_LAST_EVENT_SNOOZED_AT,
+    CONF_ANY_LAST_EVENT_STOPPED_AT,
+    CONF_BEDTIME_LAST_EVENT_AT,
+    CONF_LAST_EVENT_GOES_OFF_AT,
+    CONF_LAST_EVENT_SNOOZED_AT,
+    CONF_LAST_EVENT_STOPPED_AT,
+    CONF_WAKEUP_LAST_EVENT_GOES_OFF_AT,
+    CONF_WAKEUP_LAST_EVENT_SNOOZED_AT,
+    CONF_WAKEUP_LAST_EVENT_STOPPED_AT,
+    CONF_WAKING_UP_LAST_EVENT_AT,
+    CONF_WIND_DOWN_LAST_EVENT_AT,
+    EVENT_BEDTIME_STARTS,
+    EVENT_GOES_OFF,
+    EVENT_SNOOZED,
+    EVENT_STOPPED,
+    EVENT_WAKING_UP,
+    EVENT_WIND_DOWN_STARTS,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class EventKind:
+    source: str | None
+    event: str
+    field: str
+
+
+ALARM_EVENT_KINDS: dict[str, EventKind] = {
+    EVENT_GOES_OFF: EventKind(None, EVENT_GOES_OFF, CONF_LAST_EVENT_GOES_OFF_AT),
+    EVENT_SNOOZED: EventKind(None, EVENT_SNOOZED, CONF_LAST_EVENT_SNOOZED_AT),
+    EVENT_STOPPED: EventKind(None, EVENT_STOPPED, CONF_LAST_EVENT_STOPPED_AT),
+}
+
+DEVICE_EVENT_KINDS: dict[str, EventKind] = {
+    "wakeup_goes_off": EventKind(
+        "wakeup", EVENT_GOES_OFF, CONF_WAKEUP_LAST_EVENT_GOES_OFF_AT
+    ),
+    "wakeup_snoozed": EventKind(
+        "wakeup", EVENT_SNOOZED, CONF_WAKEUP_LAST_EVENT_SNOOZED_AT
+    ),
+    "wakeup_stopped": EventKind(
+        "wakeup", EVENT_STOPPED, CONF_WAKEUP_LAST_EVENT_STOPPED_AT
+    ),
+    "any_goes_off": EventKind("any", EVENT_GOES_OFF, CONF_ANY_LAST_EVENT_GOES_OFF_AT),
+    "any_snoozed": EventKind("any", EVENT_SNOOZED, CONF_ANY_LAST_EVENT_SNOOZED_AT),
+    "any_stopped": EventKind("any", EVENT_STOPPED, CONF_ANY_LAST_EVENT_STOPPED_AT),
+    EVENT_BEDTIME_STARTS: EventKind(
+        "bedtime", EVENT_BEDTIME_STARTS, CONF_BEDTIME_LAST_EVENT_AT
+    ),
+    EVENT_WAKING_UP: EventKind(
+        "waking_up", EVENT_WAKING_UP, CONF_WAKING_UP_LAST_EVENT_AT
+    ),
+    EVENT_WIND_DOWN_STARTS: EventKind(
+        "wind_down", EVENT_WIND_DOWN_STARTS, CONF_WIND_DOWN_LAST_EVENT_AT
+    ),
+}
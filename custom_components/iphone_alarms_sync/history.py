@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    import sqlite3
+
+    from .coordinator import AlarmEvent
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS events ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+    "event_id TEXT NOT NULL, "
+    "phone_id TEXT NOT NULL, "
+    "alarm_id TEXT NOT NULL, "
+    "event TEXT NOT NULL, "
+    "occurred_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS events_alarm_occurred_at "
+    "ON events (phone_id, alarm_id, occurred_at)",
+    "CREATE INDEX IF NOT EXISTS events_phone_occurred_at "
+    "ON events (phone_id, occurred_at)",
+)
+
+INSERT_EVENT = (
+    "INSERT INTO events (event_id, phone_id, alarm_id, event, occurred_at) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+
+COUNT_EVENTS = "SELECT COUNT(*) FROM events WHERE phone_id = ?"
+
+PRUNE_EVENTS = (
+    "DELETE FROM events WHERE id IN ("
+    "SELECT id FROM events WHERE phone_id = ? "
+    "ORDER BY occurred_at, id LIMIT ?)"
+)
+
+EventRow = tuple[str, str, str, str, float]
+
+
+def _encode_cursor(occurred_at: float, row_id: int) -> str:
+    return f"{occurred_at!r}:{row_id}"
+
+
+def _decode_cursor(cursor: str) -> tuple[float, int]:
+    occurred_at, row_id = cursor.split(":")
+    return float(occurred_at), int(row_id)
+
+
+def _row_to_event(row: tuple[Any, ...]) -> dict[str, Any]:
+    return {
+        "event_id": row[1],
+        "alarm_id": row[2],
+        "event": row[3],
+        "occurred_at": dt_util.utc_from_timestamp(row[4]).isoformat(),
+    }
+
+
+class EventHistory:
+    def __init__(
+        self, hass: HomeAssistant, path: str, max_events: int, prune_slack: int
+    ) -> None:
+        self._hass = hass
+        self._path = path
+        self._max_events = max_events
+        self._prune_slack = prune_slack
+        self._event_counts: dict[str, int] = {}
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._pending: list[EventRow] = []
+        self._write_task: asyncio.Task[None] | None = None
+
+    @callback
+    def async_append(self, phone_id: str, event: AlarmEvent) -> None:
+        self._pending.append(
+            (
+                event.event_id,
+                phone_id,
+                event.alarm_id,
+                event.event,
+                event.occurred_at.timestamp(),
+            )
+        )
+        if self._write_task is None:
+            self._write_task = self._hass.async_create_background_task(
+                self._async_write_pending(), "iphone_alarms_sync history write"
+            )
+
+    async def async_query(
+        self,
+        phone_id: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        alarm_id: str | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        await self._async_wait_for_writes()
+        clauses = ["phone_id = ?"]
+        params: list[Any] = [phone_id]
+        if alarm_id:
+            clauses.append("alarm_id = ?")
+            params.append(alarm_id)
+        if start:
+            clauses.append("occurred_at >= ?")
+            params.append(start.timestamp())
+        if end:
+            clauses.append("occurred_at < ?")
+            params.append(end.timestamp())
+        if cursor:
+            clauses.append("(occurred_at, id) > (?, ?)")
+            params.extend(_decode_cursor(cursor))
+        params.append(limit + 1)
+        query = (
+            "SELECT id, event_id, alarm_id, event, occurred_at FROM events "
+            f"WHERE {' AND '.join(clauses)} ORDER BY occurred_at, id LIMIT ?"
+        )
+        rows = await self._hass.async_add_executor_job(self._fetch, query, params)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1][4], rows[-1][0])
+        return [_row_to_event(row) for row in rows], next_cursor
+
+    async def async_recent(self, phone_id: str, limit: int) -> list[dict[str, Any]]:
+        await self._async_wait_for_writes()
+        rows = await self._hass.async_add_executor_job(
+            self._fetch,
+            "SELECT id, event_id, alarm_id, event, occurred_at FROM events "
+            "WHERE phone_id = ? ORDER BY occurred_at DESC, id DESC LIMIT ?",
+            [phone_id, limit],
+        )
+        return [_row_to_event(row) for row in reversed(rows)]
+
+    async def async_rename_phone(self, old_phone_id: str, new_phone_id: str) -> None:
+        await self._async_wait_for_writes()
+        await self._hass.async_add_executor_job(
+            self._rename_phone, old_phone_id, new_phone_id
+        )
+
+    async def async_delete_phone(self, phone_id: str) -> None:
+        await self._async_wait_for_writes()
+        await self._hass.async_add_executor_job(self._delete_phone, phone_id)
+
+    async def async_close(self, _event: Event | None = None) -> None:
+        await self._async_wait_for_writes()
+        await self._hass.async_add_executor_job(self._close)
+
+    async def _async_wait_for_writes(self) -> None:
+        if self._write_task is not None:
+            await asyncio.shield(self._write_task)
+
+    async def _async_write_pending(self) -> None:
+        try:
+            while self._pending:
+                rows, self._pending = self._pending, []
+                await self._hass.async_add_executor_job(self._insert, rows)
+        finally:
+            self._write_task = None
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            import sqlite3
+
+            connection = sqlite3.connect(self._path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            for statement in SCHEMA:
+                connection.execute(statement)
+            self._connection = connection
+        return self._connection
+
+    def _insert(self, rows: list[EventRow]) -> None:
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.executemany(INSERT_EVENT, rows)
+                for phone_id, inserted in Counter(row[1] for row in rows).items():
+                    self._prune(connection, phone_id, inserted)
+
+    def _prune(
+        self, connection: sqlite3.Connection, phone_id: str, inserted: int
+    ) -> None:
+        count = self._event_counts.get(phone_id)
+        if count is None:
+            count = connection.execute(COUNT_EVENTS, [phone_id]).fetchone()[0]
+        else:
+            count += inserted
+        if count > self._max_events + self._prune_slack:
+            count -= connection.execute(
+                PRUNE_EVENTS, [phone_id, count - self._max_events]
+            ).rowcount
+        self._event_counts[phone_id] = count
+
+    def _fetch(self, query: str, params: list[Any]) -> list[tuple[Any, ...]]:
+        with self._lock:
+            return self._get_connection().execute(query, params).fetchall()
+
+    def _rename_phone(self, old_phone_id: str, new_phone_id: str) -> None:
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.execute(
+                    "UPDATE events SET phone_id = ? WHERE phone_id = ?",
+                    [new_phone_id, old_phone_id],
+                )
+            self._event_counts.pop(old_phone_id, None)
+            self._event_counts.pop(new_phone_id, None)
+
+    def _delete_phone(self, phone_id: str) -> None:
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                connection.execute("DELETE FROM events WHERE phone_id = ?", [phone_id])
+            self._event_counts.pop(phone_id, None)
+
+    def _close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
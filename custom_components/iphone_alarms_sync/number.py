@@ -1,22 +1,42 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+
 from homeassistant.components.number import NumberEntity, NumberEntityDescription
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
-from .coordinator import IPhoneAlarmsSyncConfigEntry, IPhoneAlarmsSyncCoordinator
+from .const import DOMAIN, SIGNAL_ALARM_ADDED
+from .coordinator import (
+    AlarmData,
+    IPhoneAlarmsSyncConfigEntry,
+    IPhoneAlarmsSyncCoordinator,
+)
+from .entity import AlarmValueFn, IPhoneAlarmsSyncEntity, alarm_value_fn
+
+
+@dataclass(frozen=True, kw_only=True)
+class IPhoneAlarmsSyncNumberEntityDescription(NumberEntityDescription):
+    value_fn: AlarmValueFn[int]
+
 
-NUMBER_SENSOR_TYPES: tuple[NumberEntityDescription, ...] = (
-    NumberEntityDescription(
+def _snooze_time(alarm: AlarmData) -> int | None:
+    return int(alarm.snooze_time) if alarm.allows_snooze else None
+
+
+NUMBER_SENSOR_TYPES: tuple[IPhoneAlarmsSyncNumberEntityDescription, ...] = (
+    IPhoneAlarmsSyncNumberEntityDescription(
         key="snooze_time",
         name="Snooze Time",
         native_min_value=1,
         native_max_value=30,
         native_step=1,
         native_unit_of_measurement="min",
+        value_fn=alarm_value_fn(_snooze_time),
     ),
 )
 
@@ -53,10 +73,6 @@ async def async_setup_entry(
     if not phone:
         return
 
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN].setdefault(entry.entry_id, {})
-    hass.data[DOMAIN][entry.entry_id]["number_add_entities"] = async_add_entities
-
     for alarm_id, alarm in phone.alarms.items():
         entities.extend(
             _create_number_entities(coordinator, entry, phone.phone_id, alarm_id)
@@ -64,23 +80,45 @@ async def async_setup_entry(
 
     async_add_entities(entities)
 
+    @callback
+    def _async_add_alarms(alarm_ids: list[str]) -> None:
+        async_add_entities(
+            [
+                entity
+                for alarm_id in alarm_ids
+                for entity in _create_number_entities(
+                    coordinator, entry, phone.phone_id, alarm_id
+                )
+            ]
+        )
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_ALARM_ADDED.format(entry_id=entry.entry_id), _async_add_alarms
+        )
+    )
+
+
+class IPhoneAlarmsSyncSnoozeNumber(IPhoneAlarmsSyncEntity, NumberEntity):
+    _alarm_id: str
+    entity_description: IPhoneAlarmsSyncNumberEntityDescription
 
-class IPhoneAlarmsSyncSnoozeNumber(
-    CoordinatorEntity[IPhoneAlarmsSyncCoordinator], NumberEntity
-):
     def __init__(
         self,
         coordinator: IPhoneAlarmsSyncCoordinator,
         entry: IPhoneAlarmsSyncConfigEntry,
         phone_id: str,
         alarm_id: str,
-        description: NumberEntityDescription,
+        description: IPhoneAlarmsSyncNumberEntityDescription,
     ) -> None:
         super().__init__(coordinator)
         self._entry = entry
         self._phone_id = phone_id
         self._alarm_id = alarm_id
         self.entity_description = description
+        self._value_fn: Callable[[], int | None] = partial(
+            description.value_fn, coordinator, alarm_id
+        )
         self._attr_unique_id = (
             f"{entry.entry_id}_{phone_id}_{alarm_id}_{description.key}"
         )
@@ -100,12 +138,7 @@ class IPhoneAlarmsSyncSnoozeNumber(
 
     @property
     def native_value(self) -> int | None:
-        alarm = self.coordinator.get_alarm(self._alarm_id)
-        if not alarm:
-            return None
-        if not alarm.allows_snooze:
-            return None
-        return int(alarm.snooze_time)
+        return self._value_fn()
 
     async def async_set_native_value(self, value: float) -> None:
         alarm = self.coordinator.get_alarm(self._alarm_id)
@@ -114,7 +147,4 @@ class IPhoneAlarmsSyncSnoozeNumber(
         if not alarm.allows_snooze:
             return
         self.coordinator.update_alarm_snooze_time(self._alarm_id, int(value))
-        phone = self.coordinator.get_phone()
-        if phone:
-            self.coordinator.async_set_updated_data(phone)
-        self.async_write_ha_state()
+        self.coordinator.async_publish(self._alarm_id, self.entity_description.key)
@@ -1,14 +1,83 @@
 from __future__ import annotations
 
-import base64
+import hashlib
+import time
+from datetime import timedelta
+from functools import lru_cache
+from http import HTTPStatus
 from io import BytesIO
+from typing import cast
 
-import segno
+from aiohttp import hdrs, web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.http.auth import async_sign_path
+from homeassistant.core import HomeAssistant
 
+from .const import (
+    DATA_QR_CODE_URLS,
+    DOMAIN,
+    QR_CODE_MAX_AGE,
+    QR_CODE_URL_EXPIRATION,
+    QR_CODE_URL_RENEW_BEFORE,
+    QR_CODE_VIEW_URL,
+    SHORTCUT_QR_CODES,
+)
+
+
+@lru_cache(maxsize=8)
+def render_qr_code_png(url: str) -> tuple[bytes, str]:
+    import segno
 
-def generate_qr_code_data_url(url: str) -> str:
     qr = segno.make(url, error="M")
     buffer = BytesIO()
     qr.save(buffer, kind="png", scale=6, border=2)
-    base64_str = base64.b64encode(buffer.getvalue()).decode("utf-8")
-    return f"data:image/png;base64,{base64_str}"
+    body = buffer.getvalue()
+    return body, hashlib.sha256(body).hexdigest()
+
+
+def qr_code_url(hass: HomeAssistant, name: str) -> str:
+    urls: dict[str, tuple[str, float]] = hass.data.setdefault(DOMAIN, {}).setdefault(
+        DATA_QR_CODE_URLS, {}
+    )
+    now = time.time()
+    cached = urls.get(name)
+    if cached is not None and cached[1] - now > QR_CODE_URL_RENEW_BEFORE:
+        return cached[0]
+    url = cast(
+        str,
+        async_sign_path(
+            hass,
+            QR_CODE_VIEW_URL.format(name=name),
+            timedelta(seconds=QR_CODE_URL_EXPIRATION),
+        ),
+    )
+    urls[name] = (url, now + QR_CODE_URL_EXPIRATION)
+    return url
+
+
+class ShortcutQRCodeView(HomeAssistantView):
+    url = QR_CODE_VIEW_URL
+    name = f"api:{DOMAIN}:qr"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+
+    async def get(self, request: web.Request, name: str) -> web.Response:
+        shortcut_url = SHORTCUT_QR_CODES.get(name)
+        if shortcut_url is None:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+
+        body, etag = await self.hass.async_add_executor_job(
+            render_qr_code_png, shortcut_url
+        )
+        headers: dict[str, str] = {
+            hdrs.CACHE_CONTROL: f"private, max-age={QR_CODE_MAX_AGE}"
+        }
+        if any(tag.value == etag for tag in request.if_none_match or ()):
+            response = web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+        else:
+            response = web.Response(
+                body=body, content_type="image/png", headers=headers
+            )
+        response.etag = etag
+        return response
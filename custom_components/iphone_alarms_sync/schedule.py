@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import datetime, time, timedelta
+from heapq import merge
+from itertools import islice
+from operator import itemgetter
+from typing import TYPE_CHECKING, cast
+
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from .coordinator import PhoneData
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+ScheduleEntry = tuple[int, int, str]
+
+_offset = itemgetter(0)
+
+
+class AlarmSchedule:
+    def __init__(self, phone: PhoneData) -> None:
+        self._weekly: list[ScheduleEntry] = []
+        self._daily: list[ScheduleEntry] = []
+        self._alarm_weekly: dict[str, list[int]] = {}
+        self._alarm_daily: dict[str, int] = {}
+
+        for order, (key, alarm) in enumerate(phone.alarms.items()):
+            if not alarm.enabled:
+                continue
+            minute_of_day = alarm.hour * 60 + alarm.minute
+            if not (alarm.repeats and (alarm.repeat_days or alarm.unknown_repeat_days)):
+                self._daily.append((minute_of_day, order, key))
+                self._alarm_daily[key] = minute_of_day
+                continue
+            offsets = [
+                day * MINUTES_PER_DAY + minute_of_day
+                for day in range(7)
+                if alarm.repeat_days >> day & 1
+            ]
+            self._alarm_weekly[key] = offsets
+            self._weekly.extend((offset, order, key) for offset in offsets)
+
+        self._weekly.sort()
+        self._daily.sort()
+
+    def next_occurrence(
+        self, alarm_id: str, now: datetime | None = None
+    ) -> datetime | None:
+        now_local = dt_util.as_local(now or dt_util.utcnow())
+        minute_of_week = _minute_of_week(now_local)
+
+        if alarm_id in self._alarm_daily:
+            minute_of_day = self._alarm_daily[alarm_id]
+            if minute_of_day > minute_of_week % MINUTES_PER_DAY:
+                return _to_utc(now_local, 0, minute_of_day)
+            return None
+
+        offsets = self._alarm_weekly.get(alarm_id)
+        if not offsets:
+            return None
+        index = bisect_right(offsets, minute_of_week)
+        if index < len(offsets):
+            offset = offsets[index]
+            days_ahead = offset // MINUTES_PER_DAY - now_local.weekday()
+        else:
+            offset = offsets[0]
+            days_ahead = offset // MINUTES_PER_DAY - now_local.weekday() + 7
+        return _to_utc(now_local, days_ahead, offset % MINUTES_PER_DAY)
+
+    def next_alarm(
+        self, now: datetime | None = None
+    ) -> tuple[datetime | None, str | None]:
+        now_local = dt_util.as_local(now or dt_util.utcnow())
+        minute_of_week = _minute_of_week(now_local)
+        weekday = now_local.weekday()
+
+        weekly: ScheduleEntry | None = None
+        index = bisect_right(self._weekly, minute_of_week, key=_offset)
+        if index < len(self._weekly):
+            offset, order, alarm_id = self._weekly[index]
+            weekly = (offset - weekday * MINUTES_PER_DAY, order, alarm_id)
+        elif self._weekly and self._weekly[0][0] // MINUTES_PER_DAY != weekday:
+            offset, order, alarm_id = self._weekly[0]
+            weekly = (
+                offset - weekday * MINUTES_PER_DAY + MINUTES_PER_WEEK,
+                order,
+                alarm_id,
+            )
+
+        daily: ScheduleEntry | None = None
+        minute_of_day = minute_of_week % MINUTES_PER_DAY
+        index = bisect_right(self._daily, minute_of_day, key=_offset)
+        if index < len(self._daily):
+            daily = self._daily[index]
+
+        candidates = [candidate for candidate in (weekly, daily) if candidate]
+        if not candidates:
+            return None, None
+        minutes_ahead, _, alarm_id = min(candidates)
+        return (
+            _to_utc(
+                now_local,
+                minutes_ahead // MINUTES_PER_DAY,
+                minutes_ahead % MINUTES_PER_DAY,
+            ),
+            alarm_id,
+        )
+
+    def next_due(
+        self, now: datetime | None = None
+    ) -> tuple[datetime | None, list[str]]:
+        now_local = dt_util.as_local(now or dt_util.utcnow())
+        minute_of_week = _minute_of_week(now_local)
+        weekday = now_local.weekday()
+
+        candidates: list[ScheduleEntry] = []
+        if self._weekly:
+            index = bisect_right(self._weekly, minute_of_week, key=_offset)
+            wrap = 0
+            if index == len(self._weekly):
+                index, wrap = 0, MINUTES_PER_WEEK
+            offset = self._weekly[index][0]
+            candidates.extend(
+                (offset - weekday * MINUTES_PER_DAY + wrap, order, alarm_id)
+                for entry_offset, order, alarm_id in self._weekly[index:]
+                if entry_offset == offset
+            )
+
+        minute_of_day = minute_of_week % MINUTES_PER_DAY
+        index = bisect_right(self._daily, minute_of_day, key=_offset)
+        if index < len(self._daily):
+            offset = self._daily[index][0]
+            candidates.extend(
+                entry for entry in self._daily[index:] if entry[0] == offset
+            )
+
+        if not candidates:
+            return None, []
+        candidates.sort()
+        minutes_ahead = candidates[0][0]
+        return (
+            _to_utc(
+                now_local,
+                minutes_ahead // MINUTES_PER_DAY,
+                minutes_ahead % MINUTES_PER_DAY,
+            ),
+            [
+                alarm_id
+                for minutes, _, alarm_id in candidates
+                if minutes == minutes_ahead
+            ],
+        )
+
+    def upcoming(
+        self, count: int, now: datetime | None = None
+    ) -> list[tuple[datetime, str]]:
+        now_local = dt_util.as_local(now or dt_util.utcnow())
+        minute_of_week = _minute_of_week(now_local)
+        weekday = now_local.weekday()
+
+        weekly: list[ScheduleEntry] = []
+        if self._weekly:
+            start = bisect_right(self._weekly, minute_of_week, key=_offset)
+            for position in range(start, start + count):
+                weeks, index = divmod(position, len(self._weekly))
+                offset, order, alarm_id = self._weekly[index]
+                weekly.append(
+                    (
+                        offset - weekday * MINUTES_PER_DAY + weeks * MINUTES_PER_WEEK,
+                        order,
+                        alarm_id,
+                    )
+                )
+
+        minute_of_day = minute_of_week % MINUTES_PER_DAY
+        start = bisect_right(self._daily, minute_of_day, key=_offset)
+        daily = self._daily[start : start + count]
+
+        return [
+            (
+                _to_utc(
+                    now_local,
+                    minutes_ahead // MINUTES_PER_DAY,
+                    minutes_ahead % MINUTES_PER_DAY,
+                ),
+                alarm_id,
+            )
+            for minutes_ahead, _, alarm_id in islice(merge(weekly, daily), count)
+        ]
+
+
+def _minute_of_week(now_local: datetime) -> int:
+    return (
+        now_local.weekday() * MINUTES_PER_DAY + now_local.hour * 60 + now_local.minute
+    )
+
+
+def _to_utc(now_local: datetime, days_ahead: int, minute_of_day: int) -> datetime:
+    candidate_date = now_local.date() + timedelta(days=days_ahead)
+    alarm_time = time(hour=minute_of_day // 60, minute=minute_of_day % 60)
+    return cast(datetime, dt_util.as_utc(datetime.combine(candidate_date, alarm_time)))
@@ -1,141 +1,224 @@
 from __future__ import annotations
 
-from datetime import datetime, time, timedelta
-from typing import cast
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from operator import attrgetter
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_point_in_time
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
-from .coordinator import IPhoneAlarmsSyncConfigEntry, IPhoneAlarmsSyncCoordinator
-from .utils import calculate_next_alarm_datetime, calculate_next_occurrence
+from .const import DOMAIN, SIGNAL_ALARM_ADDED, SIGNAL_EVENT_SENSOR_ADDED
+from .coordinator import (
+    IPhoneAlarmsSyncConfigEntry,
+    IPhoneAlarmsSyncCoordinator,
+    PhoneData,
+)
+from .entity import (
+    AlarmValueFn,
+    IPhoneAlarmsSyncEntity,
+    PhoneValueFn,
+    alarm_value_fn,
+    phone_value_fn,
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class IPhoneAlarmsSyncAlarmSensorEntityDescription(SensorEntityDescription):
+    value_fn: AlarmValueFn[datetime | str]
+
+
+@dataclass(frozen=True, kw_only=True)
+class IPhoneAlarmsSyncPhoneSensorEntityDescription(SensorEntityDescription):
+    value_fn: PhoneValueFn[datetime | str | int]
+
 
-ALARM_SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
-    SensorEntityDescription(
+def _next_alarm_datetime(coordinator: IPhoneAlarmsSyncCoordinator) -> datetime | None:
+    return coordinator.get_next_alarm()[0]
+
+
+def _next_alarm_label(coordinator: IPhoneAlarmsSyncCoordinator) -> str | None:
+    _, next_alarm_id = coordinator.get_next_alarm()
+    next_alarm = coordinator.get_alarm(next_alarm_id) if next_alarm_id else None
+    return next_alarm.label if next_alarm else None
+
+
+def _count_alarms(phone: PhoneData, enabled: bool) -> int:
+    return sum(1 for alarm in phone.alarms.values() if alarm.enabled is enabled)
+
+
+ALARM_SENSOR_TYPES: tuple[IPhoneAlarmsSyncAlarmSensorEntityDescription, ...] = (
+    IPhoneAlarmsSyncAlarmSensorEntityDescription(
         key="alarm_id",
         name="ID",
+        value_fn=alarm_value_fn(attrgetter("alarm_id")),
     ),
 )
 
-ALARM_OPTIONAL_SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
-    SensorEntityDescription(
+ALARM_OPTIONAL_SENSOR_TYPES: tuple[
+    IPhoneAlarmsSyncAlarmSensorEntityDescription, ...
+] = (
+    IPhoneAlarmsSyncAlarmSensorEntityDescription(
         key="next_occurrence_datetime",
         name="Next Occurrence",
         device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=IPhoneAlarmsSyncCoordinator.get_next_occurrence,
     ),
-    SensorEntityDescription(
+    IPhoneAlarmsSyncAlarmSensorEntityDescription(
         key="last_occurrence_datetime",
         name="Last Occurrence",
         device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=alarm_value_fn(attrgetter("last_occurrence_datetime")),
     ),
 )
 
-ALARM_EVENT_SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
-    SensorEntityDescription(
+ALARM_EVENT_SENSOR_TYPES: tuple[IPhoneAlarmsSyncAlarmSensorEntityDescription, ...] = (
+    IPhoneAlarmsSyncAlarmSensorEntityDescription(
         key="last_event_goes_off_at",
         name="Last Goes Off At",
         device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=alarm_value_fn(attrgetter("last_event_goes_off_at")),
     ),
-    SensorEntityDescription(
+    IPhoneAlarmsSyncAlarmSensorEntityDescription(
         key="last_event_snoozed_at",
         name="Last Snoozed At",
         device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=alarm_value_fn(attrgetter("last_event_snoozed_at")),
     ),
-    SensorEntityDescription(
+    IPhoneAlarmsSyncAlarmSensorEntityDescription(
         key="last_event_stopped_at",
         name="Last Stopped At",
         device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=alarm_value_fn(attrgetter("last_event_stopped_at")),
     ),
 )
 
-PHONE_EVENT_SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
-    SensorEntityDescription(
+PHONE_EVENT_SENSOR_TYPES: tuple[IPhoneAlarmsSyncPhoneSensorEntityDescription, ...] = (
+    IPhoneAlarmsSyncPhoneSensorEntityDescription(
         key="wakeup_last_event_goes_off_at",
         name="Wake-Up Last Goes Off At",
         device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=phone_value_fn(attrgetter("wakeup_last_event_goes_off_at")),
     ),
-    SensorEntityDescription(
+    IPhoneAlarmsSyncPhoneSensorEntityDescription(
         key="wakeup_last_event_snoozed_at",
         name="Wake-Up Last Snoozed At",
         device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=phone_value_fn(attrgetter("wakeup_last_event_snoozed_at")),
     ),
-    SensorEntityDescription(
+    IPhoneAlarmsSyncPhoneSensorEntityDescription(
         key="wakeup_last_event_stopped_at",
         name="Wake-Up Last Stopped At",
         device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=phone_value_fn(attrgetter("wakeup_last_event_stopped_at")),
     ),
-    SensorEntityDescription(
+    IPhoneAlarmsSyncPhoneSensorEntityDescription(
         key="any_last_event_goes_off_at",
         name="Any Last Goes Off At",
         device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=phone_value_fn(attrgetter("any_last_event_goes_off_at")),
     ),
-    SensorEntityDescription(
+    IPhoneAlarmsSyncPhoneSensorEntityDescription(
         key="any_last_event_snoozed_at",
         name="Any Last Snoozed At",
         device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=phone_value_fn(attrgetter("any_last_event_snoozed_at")),
     ),
-    SensorEntityDescription(
+    IPhoneAlarmsSyncPhoneSensorEntityDescription(
         key="any_last_event_stopped_at",
         name="Any Last Stopped At",
         device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=phone_value_fn(attrgetter("any_last_event_stopped_at")),
     ),
-    SensorEntityDescription(
+    IPhoneAlarmsSyncPhoneSensorEntityDescription(
         key="bedtime_last_event_at",
         name="Bedtime Last At",
         device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=phone_value_fn(attrgetter("bedtime_last_event_at")),
     ),
-    SensorEntityDescription(
+    IPhoneAlarmsSyncPhoneSensorEntityDescription(
         key="waking_up_last_event_at",
         name="Waking Up Last At",
         device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=phone_value_fn(attrgetter("waking_up_last_event_at")),
     ),
-    SensorEntityDescription(
+    IPhoneAlarmsSyncPhoneSensorEntityDescription(
         key="wind_down_last_event_at",
         name="Wind Down Last At",
         device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=phone_value_fn(attrgetter("wind_down_last_event_at")),
     ),
 )
 
-PHONE_SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
-    SensorEntityDescription(
+ALARM_EVENT_SENSORS = {
+    description.key: description for description in ALARM_EVENT_SENSOR_TYPES
+}
+PHONE_EVENT_SENSORS = {
+    description.key: description for description in PHONE_EVENT_SENSOR_TYPES
+}
+
+PHONE_SENSOR_TYPES: tuple[IPhoneAlarmsSyncPhoneSensorEntityDescription, ...] = (
+    IPhoneAlarmsSyncPhoneSensorEntityDescription(
         key="next_alarm_datetime",
         name="Next Alarm",
         device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=_next_alarm_datetime,
     ),
-    SensorEntityDescription(
+    IPhoneAlarmsSyncPhoneSensorEntityDescription(
         key="next_alarm_label",
         name="Next Alarm Label",
+        value_fn=_next_alarm_label,
     ),
-    SensorEntityDescription(
+    IPhoneAlarmsSyncPhoneSensorEntityDescription(
         key="last_alarm_datetime",
         name="Last Alarm",
         device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=phone_value_fn(attrgetter("last_alarm_datetime")),
     ),
-    SensorEntityDescription(
+    IPhoneAlarmsSyncPhoneSensorEntityDescription(
         key="last_sync",
         name="Last Sync",
         device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=phone_value_fn(attrgetter("synced_at")),
     ),
-    SensorEntityDescription(
+    IPhoneAlarmsSyncPhoneSensorEntityDescription(
         key="enabled_alarms",
         name="Enabled Alarms",
+        value_fn=phone_value_fn(partial(_count_alarms, enabled=True)),
     ),
-    SensorEntityDescription(
+    IPhoneAlarmsSyncPhoneSensorEntityDescription(
         key="total_alarms",
         name="Total Alarms",
+        value_fn=phone_value_fn(lambda phone: len(phone.alarms)),
     ),
-    SensorEntityDescription(
+    IPhoneAlarmsSyncPhoneSensorEntityDescription(
         key="disabled_alarms",
         name="Disabled Alarms",
+        value_fn=phone_value_fn(partial(_count_alarms, enabled=False)),
+    ),
+    IPhoneAlarmsSyncPhoneSensorEntityDescription(
+        key="sync_calls_merged",
+        name="Merged Sync Calls",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=attrgetter("sync_admission.merged"),
+    ),
+    IPhoneAlarmsSyncPhoneSensorEntityDescription(
+        key="sync_calls_dropped",
+        name="Dropped Sync Calls",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=attrgetter("sync_admission.dropped"),
     ),
 )
 
@@ -157,42 +240,11 @@ def _create_alarm_sensor_entities(
                 description,
             )
         )
-    alarm = coordinator.get_alarm(alarm_id)
-    if alarm:
-        for description in ALARM_OPTIONAL_SENSOR_TYPES:
-            has_value = False
-            if description.key == "next_occurrence_datetime":
-                has_value = calculate_next_occurrence(alarm) is not None
-            elif description.key == "last_occurrence_datetime":
-                has_value = alarm.last_occurrence_datetime is not None
-            if has_value:
-                entities.append(
-                    IPhoneAlarmsSyncAlarmSensor(
-                        coordinator,
-                        entry,
-                        phone_id,
-                        alarm_id,
-                        description,
-                    )
-                )
-        for description in ALARM_EVENT_SENSOR_TYPES:
-            has_value = False
-            if (
-                description.key == "last_event_goes_off_at"
-                and alarm.last_event_goes_off_at
-            ):
-                has_value = True
-            elif (
-                description.key == "last_event_snoozed_at"
-                and alarm.last_event_snoozed_at
-            ):
-                has_value = True
-            elif (
-                description.key == "last_event_stopped_at"
-                and alarm.last_event_stopped_at
-            ):
-                has_value = True
-            if has_value:
+    if coordinator.get_alarm(alarm_id):
+        for description in (*ALARM_OPTIONAL_SENSOR_TYPES, *ALARM_EVENT_SENSOR_TYPES):
+            if description.value_fn(coordinator, alarm_id) is None:
+                continue
+            if coordinator.claim_entity_key(alarm_id, description.key):
                 entities.append(
                     IPhoneAlarmsSyncAlarmSensor(
                         coordinator,
@@ -229,54 +281,12 @@ def _create_phone_event_sensor_entities(
     phone_id: str,
 ) -> list[IPhoneAlarmsSyncPhoneSensor]:
     entities: list[IPhoneAlarmsSyncPhoneSensor] = []
-    phone = coordinator.get_phone()
-    if not phone:
+    if not coordinator.get_phone():
         return entities
     for description in PHONE_EVENT_SENSOR_TYPES:
-        has_value = False
-        if (
-            description.key == "wakeup_last_event_goes_off_at"
-            and phone.wakeup_last_event_goes_off_at
-        ):
-            has_value = True
-        elif (
-            description.key == "wakeup_last_event_snoozed_at"
-            and phone.wakeup_last_event_snoozed_at
-        ):
-            has_value = True
-        elif (
-            description.key == "wakeup_last_event_stopped_at"
-            and phone.wakeup_last_event_stopped_at
-        ):
-            has_value = True
-        elif (
-            description.key == "any_last_event_goes_off_at"
-            and phone.any_last_event_goes_off_at
-        ):
-            has_value = True
-        elif (
-            description.key == "any_last_event_snoozed_at"
-            and phone.any_last_event_snoozed_at
-        ):
-            has_value = True
-        elif (
-            description.key == "any_last_event_stopped_at"
-            and phone.any_last_event_stopped_at
-        ):
-            has_value = True
-        elif description.key == "bedtime_last_event_at" and phone.bedtime_last_event_at:
-            has_value = True
-        elif (
-            description.key == "waking_up_last_event_at"
-            and phone.waking_up_last_event_at
-        ):
-            has_value = True
-        elif (
-            description.key == "wind_down_last_event_at"
-            and phone.wind_down_last_event_at
-        ):
-            has_value = True
-        if has_value:
+        if description.value_fn(coordinator) is None:
+            continue
+        if coordinator.claim_entity_key(None, description.key):
             entities.append(
                 IPhoneAlarmsSyncPhoneSensor(
                     coordinator,
@@ -300,10 +310,6 @@ async def async_setup_entry(
     if not phone:
         return
 
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN].setdefault(entry.entry_id, {})
-    hass.data[DOMAIN][entry.entry_id]["sensor_add_entities"] = async_add_entities
-
     for alarm_id, alarm in phone.alarms.items():
         entities.extend(
             _create_alarm_sensor_entities(coordinator, entry, phone.phone_id, alarm_id)
@@ -316,28 +322,80 @@ async def async_setup_entry(
 
     async_add_entities(entities)
 
+    @callback
+    def _async_add_alarms(alarm_ids: list[str]) -> None:
+        async_add_entities(
+            [
+                entity
+                for alarm_id in alarm_ids
+                for entity in _create_alarm_sensor_entities(
+                    coordinator, entry, phone.phone_id, alarm_id
+                )
+            ]
+        )
+
+    @callback
+    def _async_add_event_sensor(alarm_id: str | None, key: str) -> None:
+        if not coordinator.claim_entity_key(alarm_id, key):
+            return
+        if alarm_id is None:
+            async_add_entities(
+                [
+                    IPhoneAlarmsSyncPhoneSensor(
+                        coordinator, entry, phone.phone_id, PHONE_EVENT_SENSORS[key]
+                    )
+                ]
+            )
+        else:
+            async_add_entities(
+                [
+                    IPhoneAlarmsSyncAlarmSensor(
+                        coordinator,
+                        entry,
+                        phone.phone_id,
+                        alarm_id,
+                        ALARM_EVENT_SENSORS[key],
+                    )
+                ]
+            )
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_ALARM_ADDED.format(entry_id=entry.entry_id), _async_add_alarms
+        )
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_EVENT_SENSOR_ADDED.format(entry_id=entry.entry_id),
+            _async_add_event_sensor,
+        )
+    )
+
+
+class IPhoneAlarmsSyncAlarmSensor(IPhoneAlarmsSyncEntity, SensorEntity):
+    _alarm_id: str
+    entity_description: IPhoneAlarmsSyncAlarmSensorEntityDescription
 
-class IPhoneAlarmsSyncAlarmSensor(
-    CoordinatorEntity[IPhoneAlarmsSyncCoordinator], SensorEntity
-):
     def __init__(
         self,
         coordinator: IPhoneAlarmsSyncCoordinator,
         entry: IPhoneAlarmsSyncConfigEntry,
         phone_id: str,
         alarm_id: str,
-        description: SensorEntityDescription,
+        description: IPhoneAlarmsSyncAlarmSensorEntityDescription,
     ) -> None:
         super().__init__(coordinator)
         self._entry = entry
         self._phone_id = phone_id
         self._alarm_id = alarm_id
         self.entity_description = description
+        self._value_fn: Callable[[], datetime | str | None] = partial(
+            description.value_fn, coordinator, alarm_id
+        )
         self._attr_unique_id = (
             f"{entry.entry_id}_{phone_id}_{alarm_id}_{description.key}"
         )
-        self._unsub_refresh: callback.CALLBACK_TYPE | None = None
-        self._is_refreshing = False
         alarm = coordinator.get_alarm(alarm_id)
         if alarm is None:
             raise ValueError(f"Alarm {alarm_id} not found")
@@ -351,126 +409,29 @@ class IPhoneAlarmsSyncAlarmSensor(
             via_device=(DOMAIN, phone_id),
         )
 
-    async def async_added_to_hass(self) -> None:
-        await super().async_added_to_hass()
-        if self.entity_description.key == "next_occurrence_datetime":
-            self._setup_refresh_timer()
-
-    async def async_will_remove_from_hass(self) -> None:
-        if self._unsub_refresh:
-            self._unsub_refresh()
-            self._unsub_refresh = None
-        await super().async_will_remove_from_hass()
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        super()._handle_coordinator_update()
-        if self.entity_description.key == "next_occurrence_datetime":
-            self._setup_refresh_timer()
-
-    def _get_next_occurrence_datetime(self) -> datetime | None:
-        alarm = self.coordinator.get_alarm(self._alarm_id)
-        if not alarm:
-            return None
-        return calculate_next_occurrence(alarm)
-
-    def _setup_refresh_timer(self) -> None:
-        if self._is_refreshing:
-            return
-        if self._unsub_refresh:
-            self._unsub_refresh()
-            self._unsub_refresh = None
-
-        next_dt = self._get_next_occurrence_datetime()
-        if next_dt is None:
-            return
-
-        now = dt_util.utcnow()
-        if next_dt <= now:
-            self._update_last_occurrence(next_dt)
-            self._is_refreshing = True
-            delayed_time = now + timedelta(seconds=0.1)
-            self._unsub_refresh = async_track_point_in_time(
-                self.hass,
-                self._delayed_refresh,
-                delayed_time,
-            )
-            return
-
-        self._unsub_refresh = async_track_point_in_time(
-            self.hass,
-            self._refresh_callback,
-            next_dt,
-        )
-
-    @callback
-    def _delayed_refresh(self, _now: datetime) -> None:
-        self._is_refreshing = False
-        self.async_write_ha_state()
-        self._setup_refresh_timer()
-
-    @callback
-    def _refresh_callback(self, now: datetime) -> None:
-        self._update_last_occurrence(now)
-        self.async_write_ha_state()
-        self._setup_refresh_timer()
-
-    def _update_last_occurrence(self, alarm_time: datetime) -> None:
-        alarm = self.coordinator.get_alarm(self._alarm_id)
-        if alarm:
-            alarm.last_occurrence_datetime = alarm_time.isoformat()
-            self.coordinator._save_to_config()
-
     @property
     def native_value(self) -> datetime | str | None:
-        alarm = self.coordinator.get_alarm(self._alarm_id)
-        if not alarm:
-            return None
-
-        if self.entity_description.key == "alarm_id":
-            return cast(str, alarm.alarm_id)
+        return self._value_fn()
 
-        if self.entity_description.key == "last_event_goes_off_at":
-            timestamp_str = cast(str | None, alarm.last_event_goes_off_at)
-            return dt_util.parse_datetime(timestamp_str) if timestamp_str else None
 
-        if self.entity_description.key == "last_event_snoozed_at":
-            timestamp_str = cast(str | None, alarm.last_event_snoozed_at)
-            return dt_util.parse_datetime(timestamp_str) if timestamp_str else None
+class IPhoneAlarmsSyncPhoneSensor(IPhoneAlarmsSyncEntity, SensorEntity):
+    entity_description: IPhoneAlarmsSyncPhoneSensorEntityDescription
 
-        if self.entity_description.key == "last_event_stopped_at":
-            timestamp_str = cast(str | None, alarm.last_event_stopped_at)
-            return dt_util.parse_datetime(timestamp_str) if timestamp_str else None
-
-        if self.entity_description.key == "next_occurrence_datetime":
-            return self._get_next_occurrence_datetime()
-
-        if self.entity_description.key == "last_occurrence_datetime":
-            timestamp_str = cast(str | None, alarm.last_occurrence_datetime)
-            return dt_util.parse_datetime(timestamp_str) if timestamp_str else None
-
-        return None
-
-
-class IPhoneAlarmsSyncPhoneSensor(
-    CoordinatorEntity[IPhoneAlarmsSyncCoordinator], SensorEntity
-):
     def __init__(
         self,
         coordinator: IPhoneAlarmsSyncCoordinator,
         entry: IPhoneAlarmsSyncConfigEntry,
         phone_id: str,
-        description: SensorEntityDescription,
+        description: IPhoneAlarmsSyncPhoneSensorEntityDescription,
     ) -> None:
         super().__init__(coordinator)
         self._entry = entry
         self._phone_id = phone_id
         self.entity_description = description
+        self._value_fn: Callable[[], datetime | str | int | None] = partial(
+            description.value_fn, coordinator
+        )
         self._attr_unique_id = f"{entry.entry_id}_{phone_id}_{description.key}"
-        self._unsub_refresh: callback.CALLBACK_TYPE | None = None
-        self._scheduled_alarm_datetime: datetime | None = None
-        self._scheduled_alarm_id: str | None = None
-        self._is_refreshing = False
         phone = coordinator.get_phone()
         if phone is None:
             raise ValueError("Phone not found")
@@ -480,205 +441,6 @@ class IPhoneAlarmsSyncPhoneSensor(
             name=phone.phone_name,
         )
 
-    async def async_added_to_hass(self) -> None:
-        await super().async_added_to_hass()
-        if self.entity_description.key == "next_alarm_datetime":
-            self._setup_refresh_timer()
-
-    async def async_will_remove_from_hass(self) -> None:
-        if self._unsub_refresh:
-            self._unsub_refresh()
-            self._unsub_refresh = None
-        await super().async_will_remove_from_hass()
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        super()._handle_coordinator_update()
-        if self.entity_description.key == "next_alarm_datetime":
-            self._setup_refresh_timer()
-
-    def _get_next_alarm_datetime(self) -> tuple[datetime | None, str | None]:
-        phone = self.coordinator.get_phone()
-        if not phone:
-            return None, None
-        return calculate_next_alarm_datetime(phone)
-
-    def _setup_refresh_timer(self) -> None:
-        if self._is_refreshing:
-            return
-        if self._unsub_refresh:
-            self._unsub_refresh()
-            self._unsub_refresh = None
-
-        next_dt, next_alarm_id = self._get_next_alarm_datetime()
-        if next_dt is None:
-            return
-
-        now = dt_util.utcnow()
-        if next_dt <= now:
-            phone = self.coordinator.get_phone()
-            if phone and next_alarm_id:
-                phone.last_alarm_datetime = next_dt.isoformat()
-                phone.last_alarm_id = next_alarm_id
-                self.coordinator._save_to_config()
-            self._is_refreshing = True
-            delayed_time = now + timedelta(seconds=0.1)
-            self._unsub_refresh = async_track_point_in_time(
-                self.hass,
-                self._delayed_refresh,
-                delayed_time,
-            )
-            return
-
-        self._scheduled_alarm_datetime = next_dt
-        self._scheduled_alarm_id = next_alarm_id
-        self._unsub_refresh = async_track_point_in_time(
-            self.hass,
-            self._refresh_callback,
-            next_dt,
-        )
-
-    @callback
-    def _delayed_refresh(self, _now: datetime) -> None:
-        self._is_refreshing = False
-        self.async_write_ha_state()
-        self._setup_refresh_timer()
-
-    @callback
-    def _refresh_callback(self, now: datetime) -> None:
-        phone = self.coordinator.get_phone()
-        if phone and self._scheduled_alarm_id and self._scheduled_alarm_datetime:
-            phone.last_alarm_datetime = self._scheduled_alarm_datetime.isoformat()
-            phone.last_alarm_id = self._scheduled_alarm_id
-            self.coordinator._save_to_config()
-        self.async_write_ha_state()
-        self._setup_refresh_timer()
-
-    def _get_next_alarm(self) -> tuple[time | None, str | None]:
-        phone = self.coordinator.get_phone()
-        if not phone:
-            return None, None
-
-        now = dt_util.utcnow()
-        current_time = now.time()
-        current_weekday = now.weekday()
-
-        next_alarm_time: time | None = None
-        next_alarm_label: str | None = None
-        min_days_ahead = 7
-
-        weekday_map = {
-            "Monday": 0,
-            "Tuesday": 1,
-            "Wednesday": 2,
-            "Thursday": 3,
-            "Friday": 4,
-            "Saturday": 5,
-            "Sunday": 6,
-        }
-
-        for alarm in phone.alarms.values():
-            if not alarm.enabled:
-                continue
-
-            alarm_time = time(hour=alarm.hour, minute=alarm.minute)
-
-            if alarm.repeats and alarm.repeat_days:
-                for day_name in alarm.repeat_days:
-                    day_num = weekday_map.get(day_name)
-                    if day_num is None:
-                        continue
-
-                    days_ahead = (day_num - current_weekday) % 7
-                    if days_ahead == 0 and alarm_time > current_time:
-                        if next_alarm_time is None or alarm_time < next_alarm_time:
-                            next_alarm_time = alarm_time
-                            next_alarm_label = alarm.label
-                            min_days_ahead = 0
-                    elif days_ahead > 0:
-                        if days_ahead < min_days_ahead or (
-                            days_ahead == min_days_ahead
-                            and (
-                                next_alarm_time is None or alarm_time < next_alarm_time
-                            )
-                        ):
-                            next_alarm_time = alarm_time
-                            next_alarm_label = alarm.label
-                            min_days_ahead = days_ahead
-            else:
-                if alarm_time > current_time:
-                    if next_alarm_time is None or alarm_time < next_alarm_time:
-                        next_alarm_time = alarm_time
-                        next_alarm_label = alarm.label
-                        min_days_ahead = 0
-
-        return next_alarm_time, next_alarm_label
-
     @property
     def native_value(self) -> datetime | str | int | None:
-        phone = self.coordinator.get_phone()
-        if not phone:
-            return None
-
-        if self.entity_description.key == "last_sync":
-            timestamp_str = cast(str | None, phone.synced_at)
-            return dt_util.parse_datetime(timestamp_str) if timestamp_str else None
-
-        if self.entity_description.key == "total_alarms":
-            return len(phone.alarms)
-
-        if self.entity_description.key == "enabled_alarms":
-            return sum(1 for alarm in phone.alarms.values() if alarm.enabled)
-
-        if self.entity_description.key == "disabled_alarms":
-            return sum(1 for alarm in phone.alarms.values() if not alarm.enabled)
-
-        if self.entity_description.key == "next_alarm_label":
-            _, label = self._get_next_alarm()
-            return label
-
-        if self.entity_description.key == "next_alarm_datetime":
-            next_dt, _ = self._get_next_alarm_datetime()
-            return next_dt
-
-        if self.entity_description.key == "last_alarm_datetime":
-            timestamp_str = cast(str | None, phone.last_alarm_datetime)
-            return dt_util.parse_datetime(timestamp_str) if timestamp_str else None
-
-        if self.entity_description.key == "wakeup_last_event_goes_off_at":
-            timestamp_str = cast(str | None, phone.wakeup_last_event_goes_off_at)
-            return dt_util.parse_datetime(timestamp_str) if timestamp_str else None
-
-        if self.entity_description.key == "wakeup_last_event_snoozed_at":
-            timestamp_str = cast(str | None, phone.wakeup_last_event_snoozed_at)
-            return dt_util.parse_datetime(timestamp_str) if timestamp_str else None
-
-        if self.entity_description.key == "wakeup_last_event_stopped_at":
-            timestamp_str = cast(str | None, phone.wakeup_last_event_stopped_at)
-            return dt_util.parse_datetime(timestamp_str) if timestamp_str else None
-
-        if self.entity_description.key == "any_last_event_goes_off_at":
-            timestamp_str = cast(str | None, phone.any_last_event_goes_off_at)
-            return dt_util.parse_datetime(timestamp_str) if timestamp_str else None
-
-        if self.entity_description.key == "any_last_event_snoozed_at":
-            timestamp_str = cast(str | None, phone.any_last_event_snoozed_at)
-            return dt_util.parse_datetime(timestamp_str) if timestamp_str else None
-
-        if self.entity_description.key == "any_last_event_stopped_at":
-            timestamp_str = cast(str | None, phone.any_last_event_stopped_at)
-            return dt_util.parse_datetime(timestamp_str) if timestamp_str else None
-
-        if self.entity_description.key == "bedtime_last_event_at":
-            timestamp_str = cast(str | None, phone.bedtime_last_event_at)
-            return dt_util.parse_datetime(timestamp_str) if timestamp_str else None
-
-        if self.entity_description.key == "waking_up_last_event_at":
-            timestamp_str = cast(str | None, phone.waking_up_last_event_at)
-            return dt_util.parse_datetime(timestamp_str) if timestamp_str else None
-
-        if self.entity_description.key == "wind_down_last_event_at":
-            timestamp_str = cast(str | None, phone.wind_down_last_event_at)
-            return dt_util.parse_datetime(timestamp_str) if timestamp_str else None
-
-        return None
+        return self._value_fn()
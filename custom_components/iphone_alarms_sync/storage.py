@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    CONF_ALARMS,
+    CONF_ANY_LAST_EVENT_GOES_OFF_AT,
+    CONF_ANY_LAST_EVENT_SNOOZED_AT,
+    CONF_ANY_LAST_EVENT_STOPPED_AT,
+    CONF_BEDTIME_LAST_EVENT_AT,
+    CONF_LAST_ALARM_DATETIME,
+    CONF_LAST_ALARM_ID,
+    CONF_LAST_EVENT_GOES_OFF_AT,
+    CONF_LAST_EVENT_SNOOZED_AT,
+    CONF_LAST_EVENT_STOPPED_AT,
+    CONF_LAST_OCCURRENCE_DATETIME,
+    CONF_SYNCED_AT,
+    CONF_WAKEUP_LAST_EVENT_GOES_OFF_AT,
+    CONF_WAKEUP_LAST_EVENT_SNOOZED_AT,
+    CONF_WAKEUP_LAST_EVENT_STOPPED_AT,
+    CONF_WAKING_UP_LAST_EVENT_AT,
+    CONF_WIND_DOWN_LAST_EVENT_AT,
+    DOMAIN,
+)
+
+STORAGE_VERSION = 1
+
+ALARM_RUNTIME_KEYS = (
+    CONF_LAST_EVENT_GOES_OFF_AT,
+    CONF_LAST_EVENT_SNOOZED_AT,
+    CONF_LAST_EVENT_STOPPED_AT,
+    CONF_LAST_OCCURRENCE_DATETIME,
+)
+
+PHONE_RUNTIME_KEYS = (
+    CONF_SYNCED_AT,
+    CONF_LAST_ALARM_DATETIME,
+    CONF_LAST_ALARM_ID,
+    CONF_WAKEUP_LAST_EVENT_GOES_OFF_AT,
+    CONF_WAKEUP_LAST_EVENT_SNOOZED_AT,
+    CONF_WAKEUP_LAST_EVENT_STOPPED_AT,
+    CONF_ANY_LAST_EVENT_GOES_OFF_AT,
+    CONF_ANY_LAST_EVENT_SNOOZED_AT,
+    CONF_ANY_LAST_EVENT_STOPPED_AT,
+    CONF_BEDTIME_LAST_EVENT_AT,
+    CONF_WAKING_UP_LAST_EVENT_AT,
+    CONF_WIND_DOWN_LAST_EVENT_AT,
+)
+
+
+def create_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+def split_runtime_options(
+    options: dict[str, Any],
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    config_alarms: dict[str, Any] = {}
+    runtime_alarms: dict[str, Any] = {}
+    for alarm_id, alarm_dict in options.get(CONF_ALARMS, {}).items():
+        config_alarms[alarm_id] = {
+            key: value
+            for key, value in alarm_dict.items()
+            if key not in ALARM_RUNTIME_KEYS
+        }
+        runtime_alarms[alarm_id] = {
+            key: alarm_dict.get(key) for key in ALARM_RUNTIME_KEYS
+        }
+
+    config = {
+        key: value for key, value in options.items() if key not in PHONE_RUNTIME_KEYS
+    }
+    config[CONF_ALARMS] = config_alarms
+    runtime = {key: options.get(key) for key in PHONE_RUNTIME_KEYS}
+    runtime[CONF_ALARMS] = runtime_alarms
+    return config, runtime
+
+
+async def async_migrate_runtime_to_store(
+    hass: HomeAssistant, entry_id: str, options: dict[str, Any]
+) -> dict[str, Any]:
+    config, runtime = split_runtime_options(options)
+    await create_store(hass, entry_id).async_save(runtime)
+    return config
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import re
-from datetime import datetime, time, timedelta
-from typing import TYPE_CHECKING, cast
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
 
 from homeassistant.util import dt as dt_util
 
-if TYPE_CHECKING:
-    from .coordinator import AlarmData, PhoneData
+from .const import CONF_ALARM_ID
 
 WEEKDAY_MAP = {
     "Monday": 0,
@@ -19,138 +21,29 @@ WEEKDAY_MAP = {
     "Sunday": 6,
 }
 
+WEEKDAY_NAMES = tuple(WEEKDAY_MAP)
+
 UUID_PATTERN = re.compile(
     r"([0-9A-F]{8}-[0-9A-F]{4}-[0-9A-F]{4}-[0-9A-F]{4}-[0-9A-F]{12})",
     re.IGNORECASE,
 )
 
 
-def calculate_next_occurrence(
-    alarm: AlarmData, now: datetime | None = None
-) -> datetime | None:
-    if not alarm.enabled:
-        return None
-
-    if now is None:
-        now = dt_util.utcnow()
-
-    now_local = dt_util.as_local(now)
-    current_time = now_local.time()
-    current_weekday = now_local.weekday()
-    current_date = now_local.date()
-
-    alarm_time = time(hour=alarm.hour, minute=alarm.minute)
-
-    if alarm.repeats and alarm.repeat_days:
-        min_days_ahead = 7
-        next_datetime = None
-
-        for day_name in alarm.repeat_days:
-            day_num = WEEKDAY_MAP.get(day_name)
-            if day_num is None:
-                continue
-
-            days_ahead = (day_num - current_weekday) % 7
-            if days_ahead == 0 and alarm_time <= current_time:
-                days_ahead = 7
-            candidate_date = current_date + timedelta(days=days_ahead)
-            combined = datetime.combine(candidate_date, alarm_time)
-            candidate_datetime = dt_util.as_utc(combined)
-
-            if days_ahead == 0:
-                if next_datetime is None or candidate_datetime < next_datetime:
-                    next_datetime = candidate_datetime
-                    min_days_ahead = 0
-            elif days_ahead > 0:
-                if days_ahead < min_days_ahead or (
-                    days_ahead == min_days_ahead
-                    and (next_datetime is None or candidate_datetime < next_datetime)
-                ):
-                    next_datetime = candidate_datetime
-                    min_days_ahead = days_ahead
-
-        if next_datetime is None:
-            for day_name in alarm.repeat_days:
-                day_num = WEEKDAY_MAP.get(day_name)
-                if day_num is None:
-                    continue
-                days_ahead = (day_num - current_weekday) % 7
-                if days_ahead > 0:
-                    candidate_date = current_date + timedelta(days=days_ahead)
-                    combined = datetime.combine(candidate_date, alarm_time)
-                    candidate_datetime = dt_util.as_utc(combined)
-                    if next_datetime is None or candidate_datetime < next_datetime:
-                        next_datetime = candidate_datetime
-
-        return next_datetime
-    else:
-        combined = datetime.combine(current_date, alarm_time)
-        alarm_datetime = cast(datetime, dt_util.as_utc(combined))
-        if alarm_time > current_time:
-            return alarm_datetime
-        return None
-
-
-def calculate_next_alarm_datetime(
-    phone: PhoneData, now: datetime | None = None
-) -> tuple[datetime | None, str | None]:
-    if now is None:
-        now = dt_util.utcnow()
-
-    now_local = dt_util.as_local(now)
-    current_time = now_local.time()
-    current_weekday = now_local.weekday()
-    current_date = now_local.date()
-
-    next_alarm_datetime: datetime | None = None
-    next_alarm_id: str | None = None
-    min_days_ahead = 7
-
-    for alarm in phone.alarms.values():
-        if not alarm.enabled:
-            continue
-
-        alarm_time = time(hour=alarm.hour, minute=alarm.minute)
-
-        if alarm.repeats and alarm.repeat_days:
-            for day_name in alarm.repeat_days:
-                day_num = WEEKDAY_MAP.get(day_name)
-                if day_num is None:
-                    continue
-
-                days_ahead = (day_num - current_weekday) % 7
-                candidate_date = current_date + timedelta(days=days_ahead)
-                combined = datetime.combine(candidate_date, alarm_time)
-                candidate_datetime = dt_util.as_utc(combined)
-
-                if days_ahead == 0 and alarm_time > current_time:
-                    if (
-                        next_alarm_datetime is None
-                        or candidate_datetime < next_alarm_datetime
-                    ):
-                        next_alarm_datetime = candidate_datetime
-                        next_alarm_id = alarm.alarm_id
-                        min_days_ahead = 0
-                elif days_ahead > 0:
-                    if days_ahead < min_days_ahead or (
-                        days_ahead == min_days_ahead
-                        and (
-                            next_alarm_datetime is None
-                            or candidate_datetime < next_alarm_datetime
-                        )
-                    ):
-                        next_alarm_datetime = candidate_datetime
-                        next_alarm_id = alarm.alarm_id
-                        min_days_ahead = days_ahead
+def parse_weekdays(day_names: Iterable[str]) -> tuple[int, tuple[str, ...]]:
+    mask = 0
+    unknown_names = []
+    for day_name in day_names:
+        if day_name in WEEKDAY_MAP:
+            mask |= 1 << WEEKDAY_MAP[day_name]
         else:
-            alarm_datetime = dt_util.as_utc(datetime.combine(current_date, alarm_time))
-            if alarm_time > current_time:
-                if next_alarm_datetime is None or alarm_datetime < next_alarm_datetime:
-                    next_alarm_datetime = alarm_datetime
-                    next_alarm_id = alarm.alarm_id
-                    min_days_ahead = 0
+            unknown_names.append(day_name)
+    return mask, tuple(unknown_names)
+
 
-    return next_alarm_datetime, next_alarm_id
+def weekday_names(mask: int, unknown_names: Iterable[str] = ()) -> list[str]:
+    names = [name for day, name in enumerate(WEEKDAY_NAMES) if mask >> day & 1]
+    names.extend(unknown_names)
+    return names
 
 
 def extract_alarm_uuid(alarm_id: str) -> str:
@@ -158,3 +51,21 @@ def extract_alarm_uuid(alarm_id: str) -> str:
     if match:
         return match.group(1).upper()
     return alarm_id
+
+
+def compute_alarms_fingerprint(alarms: list[dict[str, Any]]) -> str:
+    canonical = json.dumps(
+        sorted(alarms, key=lambda alarm: str(alarm.get(CONF_ALARM_ID))),
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def parse_timestamp(value: str | None) -> datetime | None:
+    return dt_util.parse_datetime(value) if value else None
+
+
+def format_timestamp(value: datetime | None) -> str | None:
+    return value.isoformat() if value else None
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.iphone_alarms_sync import admission
+from custom_components.iphone_alarms_sync.admission import SyncAdmission
+from custom_components.iphone_alarms_sync.const import SYNC_RATE_LIMIT_PERIOD
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(admission, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def _apply(applied: list[str], name: str) -> admission.SyncApplyFn:
+    def apply() -> dict[str, Any]:
+        applied.append(name)
+        return {"name": name}
+
+    return apply
+
+
+async def test_submissions_inside_window_are_merged(
+    hass: HomeAssistant, clock: _Clock
+) -> None:
+    applied: list[str] = []
+    updates: list[None] = []
+    sync_admission = SyncAdmission(hass, 10, 10, lambda: updates.append(None))
+
+    assert await sync_admission.async_submit(_apply(applied, "first")) == {
+        "name": "first"
+    }
+    second = hass.async_create_task(
+        sync_admission.async_submit(_apply(applied, "second"))
+    )
+    await asyncio.sleep(0)
+    third = hass.async_create_task(
+        sync_admission.async_submit(_apply(applied, "third"))
+    )
+    await asyncio.sleep(0)
+
+    assert not second.done()
+    assert sync_admission.merged == 1
+    assert len(updates) == 1
+
+    sync_admission.async_flush()
+
+    assert await second == {"name": "third"}
+    assert await third == {"name": "third"}
+    assert applied == ["first", "third"]
+
+
+async def test_pending_submission_is_flushed_by_timer(
+    hass: HomeAssistant, clock: _Clock
+) -> None:
+    applied: list[str] = []
+    sync_admission = SyncAdmission(hass, 10, 10, lambda: None)
+
+    await sync_admission.async_submit(_apply(applied, "first"))
+    clock.now += 4
+    pending = hass.async_create_task(
+        sync_admission.async_submit(_apply(applied, "second"))
+    )
+    await asyncio.sleep(0)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=5))
+    await asyncio.sleep(0)
+    assert not pending.done()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=7))
+    assert await pending == {"name": "second"}
+    assert applied == ["first", "second"]
+
+
+async def test_submissions_over_rate_limit_are_dropped(
+    hass: HomeAssistant, clock: _Clock
+) -> None:
+    applied: list[str] = []
+    updates: list[None] = []
+    sync_admission = SyncAdmission(hass, 0, 2, lambda: updates.append(None))
+
+    assert await sync_admission.async_submit(_apply(applied, "first"))
+    assert await sync_admission.async_submit(_apply(applied, "second"))
+    assert await sync_admission.async_submit(_apply(applied, "third")) is None
+    assert sync_admission.dropped == 1
+    assert len(updates) == 1
+
+    clock.now += SYNC_RATE_LIMIT_PERIOD
+    assert await sync_admission.async_submit(_apply(applied, "fourth"))
+    assert applied == ["first", "second", "fourth"]
+
+
+async def test_flush_without_pending_submission_is_noop(
+    hass: HomeAssistant, clock: _Clock
+) -> None:
+    applied: list[str] = []
+    sync_admission = SyncAdmission(hass, 10, 1, lambda: None)
+
+    sync_admission.async_flush()
+    assert await sync_admission.async_submit(_apply(applied, "first"))
+    assert applied == ["first"]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.iphone_alarms_sync import coordinator as coordinator_module
+from custom_components.iphone_alarms_sync.const import (
+    DOMAIN,
+    EVENT_KEY_CACHE_SIZE,
+    EVENT_KEY_TTL,
+)
+from custom_components.iphone_alarms_sync.coordinator import (
+    IPhoneAlarmsSyncCoordinator,
+)
+from custom_components.iphone_alarms_sync.history import EventHistory
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(
+        coordinator_module, "time", SimpleNamespace(monotonic=clock.monotonic)
+    )
+    return clock
+
+
+@pytest.fixture
+def coordinator(hass: HomeAssistant, tmp_path: Path) -> IPhoneAlarmsSyncCoordinator:
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={"phone_id": "phone", "phone_name": "Phone"}
+    )
+    history = EventHistory(hass, str(tmp_path / "history.db"), 10, 0)
+    return IPhoneAlarmsSyncCoordinator(hass, entry, history)
+
+
+def test_claim_event_key_rejects_duplicates(
+    coordinator: IPhoneAlarmsSyncCoordinator, clock: _Clock
+) -> None:
+    assert coordinator.claim_event_key("key")
+    assert not coordinator.claim_event_key("key")
+    assert coordinator.claim_event_key("other")
+
+
+def test_claim_event_key_expires_after_ttl(
+    coordinator: IPhoneAlarmsSyncCoordinator, clock: _Clock
+) -> None:
+    assert coordinator.claim_event_key("key")
+    clock.now += EVENT_KEY_TTL - 1
+    assert not coordinator.claim_event_key("key")
+    clock.now += 1
+    assert coordinator.claim_event_key("key")
+
+
+def test_claim_event_key_evicts_oldest_over_cap(
+    coordinator: IPhoneAlarmsSyncCoordinator, clock: _Clock
+) -> None:
+    for index in range(EVENT_KEY_CACHE_SIZE + 1):
+        assert coordinator.claim_event_key(f"key_{index}")
+
+    assert not coordinator.claim_event_key(f"key_{EVENT_KEY_CACHE_SIZE}")
+    assert not coordinator.claim_event_key("key_1")
+    assert coordinator.claim_event_key("key_0")
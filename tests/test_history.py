@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.iphone_alarms_sync.coordinator import AlarmEvent
+from custom_components.iphone_alarms_sync.history import EventHistory
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def history(hass: HomeAssistant, tmp_path: Path) -> AsyncIterator[EventHistory]:
+    history = EventHistory(hass, str(tmp_path / "history.db"), 3, 2)
+    yield history
+    await history.async_close()
+
+
+def _append(history: EventHistory, phone_id: str, minute: int) -> None:
+    history.async_append(
+        phone_id,
+        AlarmEvent(
+            event_uuid=uuid.uuid4().int,
+            alarm_id=f"alarm_{minute}",
+            event="goes_off",
+            occurred_at=START + timedelta(minutes=minute),
+        ),
+    )
+
+
+async def _alarm_ids(history: EventHistory, phone_id: str) -> list[str]:
+    events, _ = await history.async_query(phone_id)
+    return [event["alarm_id"] for event in events]
+
+
+async def test_prune_waits_for_slack(history: EventHistory) -> None:
+    for minute in range(5):
+        _append(history, "phone", minute)
+        assert len(await _alarm_ids(history, "phone")) == minute + 1
+
+
+async def test_prune_keeps_newest_events(history: EventHistory) -> None:
+    for minute in (1, 2, 3, 4, 5):
+        _append(history, "phone", minute)
+    _append(history, "phone", 0)
+    _append(history, "other", 0)
+
+    assert await _alarm_ids(history, "phone") == ["alarm_3", "alarm_4", "alarm_5"]
+    assert await _alarm_ids(history, "other") == ["alarm_0"]
+
+
+async def test_prune_counts_existing_rows(hass: HomeAssistant, tmp_path: Path) -> None:
+    path = str(tmp_path / "history.db")
+    history = EventHistory(hass, path, 3, 2)
+    for minute in range(5):
+        _append(history, "phone", minute)
+    await history.async_close()
+
+    history = EventHistory(hass, path, 3, 2)
+    _append(history, "phone", 5)
+    assert await _alarm_ids(history, "phone") == ["alarm_3", "alarm_4", "alarm_5"]
+    await history.async_close()
+
+
+async def test_query_pages_through_events(history: EventHistory) -> None:
+    for minute in (0, 1, 1, 1, 2):
+        _append(history, "phone", minute)
+    events, cursor = await history.async_query("phone")
+    assert cursor is None
+
+    pages = []
+    while True:
+        page, cursor = await history.async_query("phone", limit=2, cursor=cursor)
+        pages.append(page)
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [event for page in pages for event in page] == events
+    assert len({event["event_id"] for event in events}) == 5
+
+
+async def test_query_filters_by_alarm_and_range(history: EventHistory) -> None:
+    for minute in range(4):
+        _append(history, "phone", minute)
+    _append(history, "other", 1)
+
+    events, cursor = await history.async_query(
+        "phone",
+        start=START + timedelta(minutes=1),
+        end=START + timedelta(minutes=3),
+    )
+    assert [event["alarm_id"] for event in events] == ["alarm_1", "alarm_2"]
+    assert cursor is None
+
+    events, _ = await history.async_query("phone", alarm_id="alarm_3")
+    assert [event["occurred_at"] for event in events] == [
+        (START + timedelta(minutes=3)).isoformat()
+    ]
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+PACKAGE = "custom_components.iphone_alarms_sync"
+
+
+@pytest.fixture(scope="module")
+def imported_modules() -> set[str]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {PACKAGE}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+def test_package_is_imported(imported_modules: set[str]) -> None:
+    assert PACKAGE in imported_modules
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "segno",
+        "sqlite3",
+        f"{PACKAGE}.binary_sensor",
+        f"{PACKAGE}.number",
+        f"{PACKAGE}.sensor",
+    ],
+)
+def test_heavy_module_is_not_imported(imported_modules: set[str], module: str) -> None:
+    assert module not in imported_modules
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from custom_components.iphone_alarms_sync.coordinator import AlarmData, AlarmEvent
+from custom_components.iphone_alarms_sync.utils import parse_weekdays
+
+COUNT = 2000
+REPEAT_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class LegacyAlarmData:
+    alarm_id: str
+    label: str
+    enabled: bool
+    hour: int
+    minute: int
+    repeats: bool
+    repeat_days: list[str]
+    allows_snooze: bool
+    snooze_time: int = 9
+    last_event_goes_off_at: str | None = None
+    last_event_snoozed_at: str | None = None
+    last_event_stopped_at: str | None = None
+    last_occurrence_datetime: str | None = None
+    icon: str = "mdi:alarm"
+
+
+@dataclass
+class LegacyAlarmEvent:
+    event_id: str
+    alarm_id: str
+    phone_id: str
+    event: str
+    occurred_at: str
+
+
+def _footprint(factory: Callable[[int], Any]) -> float:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        items = [factory(index) for index in range(COUNT)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del items
+    return (after - before) / COUNT
+
+
+def _alarm_id(index: int) -> str:
+    return str(uuid.UUID(int=index)).upper()
+
+
+def _legacy_alarm(index: int) -> LegacyAlarmData:
+    return LegacyAlarmData(
+        alarm_id=_alarm_id(index),
+        label=f"Alarm {index}",
+        enabled=True,
+        hour=7,
+        minute=30,
+        repeats=True,
+        repeat_days=list(REPEAT_DAYS),
+        allows_snooze=True,
+    )
+
+
+def _alarm(index: int) -> AlarmData:
+    repeat_days, unknown_repeat_days = parse_weekdays(REPEAT_DAYS)
+    return AlarmData(
+        alarm_id=_alarm_id(index),
+        label=f"Alarm {index}",
+        enabled=True,
+        hour=7,
+        minute=30,
+        repeats=True,
+        repeat_days=repeat_days,
+        allows_snooze=True,
+        unknown_repeat_days=unknown_repeat_days,
+    )
+
+
+def _legacy_event(index: int) -> LegacyAlarmEvent:
+    return LegacyAlarmEvent(
+        event_id=str(uuid.uuid4()),
+        alarm_id="wakeup",
+        phone_id="phone",
+        event="goes_off",
+        occurred_at=(START + timedelta(minutes=index)).isoformat(),
+    )
+
+
+def _event(index: int) -> AlarmEvent:
+    return AlarmEvent(
+        event_uuid=uuid.uuid4().int,
+        alarm_id="wakeup",
+        event="goes_off",
+        occurred_at=START + timedelta(minutes=index),
+    )
+
+
+def test_alarm_footprint() -> None:
+    legacy = _footprint(_legacy_alarm)
+    compact = _footprint(_alarm)
+    assert compact < legacy * 0.8, f"per alarm: {legacy:.0f} B -> {compact:.0f} B"
+
+
+def test_event_footprint() -> None:
+    legacy = _footprint(_legacy_event)
+    compact = _footprint(_event)
+    assert compact < legacy * 0.8, f"per event: {legacy:.0f} B -> {compact:.0f} B"
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.iphone_alarms_sync.const import DOMAIN
+
+KITCHEN_ALARM = "11111111-2222-3333-4444-555555555555"
+BEDROOM_ALARM = "66666666-7777-8888-9999-000000000000"
+
+
+def _alarm(alarm_id: str, last_event_goes_off_at: str) -> dict[str, Any]:
+    return {
+        "alarm_id": alarm_id,
+        "label": "Wake",
+        "enabled": True,
+        "hour": 7,
+        "minute": 0,
+        "repeats": True,
+        "repeat_days": ["Monday"],
+        "allows_snooze": True,
+        "snooze_time": 9,
+        "last_event_goes_off_at": last_event_goes_off_at,
+    }
+
+
+async def test_migrate_v2_splits_phones_into_entries(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data={},
+        options={
+            "phones": {
+                "kitchen": {
+                    "phone_id": "kitchen",
+                    "phone_name": "Kitchen",
+                    "alarms": {
+                        KITCHEN_ALARM: _alarm(
+                            KITCHEN_ALARM, "2026-01-05T07:00:00+00:00"
+                        )
+                    },
+                },
+                "bedroom": {
+                    "phone_id": "bedroom",
+                    "phone_name": "Bedroom",
+                    "alarms": {
+                        BEDROOM_ALARM: _alarm(
+                            BEDROOM_ALARM, "2026-01-06T07:00:00+00:00"
+                        )
+                    },
+                },
+            }
+        },
+    )
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    entries = {
+        config_entry.unique_id: config_entry
+        for config_entry in hass.config_entries.async_entries(DOMAIN)
+    }
+    assert set(entries) == {"kitchen", "bedroom"}
+    for phone_id, alarm_id, goes_off_at in (
+        ("kitchen", KITCHEN_ALARM, "2026-01-05T07:00:00+00:00"),
+        ("bedroom", BEDROOM_ALARM, "2026-01-06T07:00:00+00:00"),
+    ):
+        migrated = entries[phone_id]
+        assert migrated.version == 4
+        assert migrated.data["phone_id"] == phone_id
+        assert set(migrated.options["alarms"]) == {alarm_id}
+        assert "last_event_goes_off_at" not in migrated.options["alarms"][alarm_id]
+        stored = hass_storage[f"{DOMAIN}.{migrated.entry_id}"]["data"]
+        assert stored["alarms"][alarm_id]["last_event_goes_off_at"] == goes_off_at
+        alarm = migrated.runtime_data.coordinator.get_alarm(alarm_id)
+        assert alarm is not None
+        assert alarm.last_event_goes_off_at is not None
+        assert alarm.last_event_goes_off_at.isoformat() == goes_off_at
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from http import HTTPStatus
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+from custom_components.iphone_alarms_sync.const import (
+    DOMAIN,
+    QR_CODE_SYNC,
+    QR_CODE_URL_EXPIRATION,
+    QR_CODE_URL_RENEW_BEFORE,
+    QR_CODE_VIEW_URL,
+)
+from custom_components.iphone_alarms_sync.qr_code import qr_code_url
+
+
+async def test_signed_url_is_reused_until_renewal(
+    hass: HomeAssistant,
+    hass_client_no_auth: ClientSessionGenerator,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    assert await async_setup_component(hass, DOMAIN, {})
+    client = await hass_client_no_auth()
+
+    response = await client.get(QR_CODE_VIEW_URL.format(name=QR_CODE_SYNC))
+    assert response.status == HTTPStatus.UNAUTHORIZED
+
+    url = qr_code_url(hass, QR_CODE_SYNC)
+    assert qr_code_url(hass, QR_CODE_SYNC) == url
+    response = await client.get(url)
+    assert response.status == HTTPStatus.OK
+    etag = response.headers["ETag"]
+
+    freezer.tick(QR_CODE_URL_EXPIRATION - QR_CODE_URL_RENEW_BEFORE - 1)
+    assert qr_code_url(hass, QR_CODE_SYNC) == url
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status == HTTPStatus.NOT_MODIFIED
+
+    freezer.tick(2)
+    renewed_url = qr_code_url(hass, QR_CODE_SYNC)
+    assert renewed_url != url
+    response = await client.get(renewed_url)
+    assert response.status == HTTPStatus.OK
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime, time, timedelta, timezone
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.iphone_alarms_sync.coordinator import AlarmData, PhoneData
+from custom_components.iphone_alarms_sync.schedule import AlarmSchedule
+from custom_components.iphone_alarms_sync.utils import WEEKDAY_MAP, weekday_names
+
+TIME_ZONES = ("UTC", "America/New_York", "Europe/Berlin", "Australia/Lord_Howe")
+
+REPEAT_MASKS = (0, 0b0000001, 0b0011111, 0b1100000, 0b1010101, 0b1111111)
+
+WINDOW_STARTS = (
+    datetime(2026, 3, 4, tzinfo=timezone.utc),
+    datetime(2026, 3, 25, tzinfo=timezone.utc),
+    datetime(2026, 4, 1, tzinfo=timezone.utc),
+    datetime(2026, 9, 30, tzinfo=timezone.utc),
+    datetime(2026, 10, 21, tzinfo=timezone.utc),
+    datetime(2026, 10, 28, tzinfo=timezone.utc),
+)
+
+
+def _reference_next_occurrence(alarm: AlarmData, now: datetime) -> datetime | None:
+    if not alarm.enabled:
+        return None
+
+    now_local = dt_util.as_local(now)
+    current_time = now_local.time()
+    current_weekday = now_local.weekday()
+    current_date = now_local.date()
+
+    alarm_time = time(hour=alarm.hour, minute=alarm.minute)
+
+    if alarm.repeats and (alarm.repeat_days or alarm.unknown_repeat_days):
+        min_days_ahead = 7
+        next_datetime = None
+
+        for day_name in weekday_names(alarm.repeat_days, alarm.unknown_repeat_days):
+            day_num = WEEKDAY_MAP.get(day_name)
+            if day_num is None:
+                continue
+            days_ahead = (day_num - current_weekday) % 7
+            if days_ahead == 0 and alarm_time <= current_time:
+                days_ahead = 7
+            candidate_date = current_date + timedelta(days=days_ahead)
+            combined = datetime.combine(candidate_date, alarm_time)
+            candidate_datetime = dt_util.as_utc(combined)
+
+            if days_ahead == 0:
+                if next_datetime is None or candidate_datetime < next_datetime:
+                    next_datetime = candidate_datetime
+                    min_days_ahead = 0
+            elif days_ahead > 0:
+                if days_ahead < min_days_ahead or (
+                    days_ahead == min_days_ahead
+                    and (next_datetime is None or candidate_datetime < next_datetime)
+                ):
+                    next_datetime = candidate_datetime
+                    min_days_ahead = days_ahead
+
+        return next_datetime
+
+    combined = datetime.combine(current_date, alarm_time)
+    if alarm_time > current_time:
+        return dt_util.as_utc(combined)
+    return None
+
+
+def _reference_next_alarm(
+    phone: PhoneData, now: datetime
+) -> tuple[datetime | None, str | None]:
+    now_local = dt_util.as_local(now)
+    current_time = now_local.time()
+    current_weekday = now_local.weekday()
+    current_date = now_local.date()
+
+    next_alarm_datetime: datetime | None = None
+    next_alarm_id: str | None = None
+    min_days_ahead = 7
+
+    for alarm in phone.alarms.values():
+        if not alarm.enabled:
+            continue
+
+        alarm_time = time(hour=alarm.hour, minute=alarm.minute)
+
+        if alarm.repeats and (alarm.repeat_days or alarm.unknown_repeat_days):
+            for day_name in weekday_names(alarm.repeat_days, alarm.unknown_repeat_days):
+                day_num = WEEKDAY_MAP.get(day_name)
+                if day_num is None:
+                    continue
+                days_ahead = (day_num - current_weekday) % 7
+                candidate = dt_util.as_utc(
+                    datetime.combine(
+                        current_date + timedelta(days=days_ahead), alarm_time
+                    )
+                )
+                if days_ahead == 0 and alarm_time > current_time:
+                    if next_alarm_datetime is None or candidate < next_alarm_datetime:
+                        next_alarm_datetime = candidate
+                        next_alarm_id = alarm.alarm_id
+                        min_days_ahead = 0
+                elif days_ahead > 0:
+                    if days_ahead < min_days_ahead or (
+                        days_ahead == min_days_ahead
+                        and (
+                            next_alarm_datetime is None
+                            or candidate < next_alarm_datetime
+                        )
+                    ):
+                        next_alarm_datetime = candidate
+                        next_alarm_id = alarm.alarm_id
+                        min_days_ahead = days_ahead
+        elif alarm_time > current_time:
+            candidate = dt_util.as_utc(datetime.combine(current_date, alarm_time))
+            if next_alarm_datetime is None or candidate < next_alarm_datetime:
+                next_alarm_datetime = candidate
+                next_alarm_id = alarm.alarm_id
+                min_days_ahead = 0
+
+    return next_alarm_datetime, next_alarm_id
+
+
+def _phone(repeat_days: int) -> PhoneData:
+    alarms = [
+        ("early", 0, 0, True, repeat_days),
+        ("fold", 1, 30, True, repeat_days),
+        ("morning", 7, 15, True, repeat_days),
+        ("morning_twin", 7, 15, True, repeat_days),
+        ("weekdays", 6, 45, True, 0b0011111),
+        ("one_shot", 12, 0, False, 0),
+        ("disabled", 9, 0, True, 0b1111111),
+        ("late", 23, 45, True, repeat_days),
+        ("localized", 8, 0, True, repeat_days),
+    ]
+    return PhoneData(
+        phone_id="phone",
+        phone_name="Phone",
+        mobile_app_device_id=None,
+        alarms={
+            alarm_id: AlarmData(
+                alarm_id=alarm_id,
+                label=alarm_id,
+                enabled=alarm_id != "disabled",
+                hour=hour,
+                minute=minute,
+                repeats=repeats,
+                repeat_days=mask,
+                allows_snooze=True,
+                unknown_repeat_days=("Montag",) if alarm_id == "localized" else (),
+            )
+            for alarm_id, hour, minute, repeats, mask in alarms
+        },
+    )
+
+
+def _instants() -> Iterator[datetime]:
+    for start in WINDOW_STARTS:
+        for step in range(0, 10 * 24 * 60, 53):
+            yield start + timedelta(minutes=step)
+
+
+@pytest.fixture(params=TIME_ZONES)
+def time_zone(request: pytest.FixtureRequest) -> Iterator[None]:
+    original = dt_util.DEFAULT_TIME_ZONE
+    dt_util.set_default_time_zone(dt_util.get_time_zone(request.param))
+    yield
+    dt_util.set_default_time_zone(original)
+
+
+@pytest.mark.usefixtures("time_zone")
+@pytest.mark.parametrize("repeat_days", REPEAT_MASKS)
+def test_next_occurrence_matches_reference(repeat_days: int) -> None:
+    phone = _phone(repeat_days)
+    schedule = AlarmSchedule(phone)
+    for now in _instants():
+        for alarm_id, alarm in phone.alarms.items():
+            assert schedule.next_occurrence(
+                alarm_id, now
+            ) == _reference_next_occurrence(alarm, now), (alarm_id, now)
+
+
+@pytest.mark.usefixtures("time_zone")
+@pytest.mark.parametrize("repeat_days", REPEAT_MASKS)
+def test_next_alarm_matches_reference(repeat_days: int) -> None:
+    phone = _phone(repeat_days)
+    schedule = AlarmSchedule(phone)
+    for now in _instants():
+        assert schedule.next_alarm(now) == _reference_next_alarm(phone, now), now
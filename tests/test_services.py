@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.iphone_alarms_sync.const import DOMAIN
+
+ALARM_ID = "11111111-2222-3333-4444-555555555555"
+STALE_ALARM_ID = "66666666-7777-8888-9999-000000000000"
+
+
+@pytest.fixture
+async def entry(hass: HomeAssistant) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=4,
+        unique_id="phone",
+        data={"phone_id": "phone", "phone_name": "Phone"},
+        options={
+            "alarms": {
+                ALARM_ID: {
+                    "alarm_id": ALARM_ID,
+                    "label": "Wake",
+                    "enabled": True,
+                    "hour": 7,
+                    "minute": 0,
+                    "repeats": False,
+                    "repeat_days": [],
+                    "allows_snooze": True,
+                }
+            }
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_report_events_skips_unknown_alarms(
+    hass: HomeAssistant, entry: MockConfigEntry, caplog: pytest.LogCaptureFixture
+) -> None:
+    fired: list[dict[str, Any]] = []
+
+    def _record(event: Event) -> None:
+        fired.append(event.data)
+
+    hass.bus.async_listen(f"{DOMAIN}_alarm_event", _record)
+
+    await hass.services.async_call(
+        DOMAIN,
+        "report_events",
+        {
+            "phone_id": "phone",
+            "events": [
+                {
+                    "alarm_id": STALE_ALARM_ID,
+                    "event": "goes_off",
+                    "occurred_at": "2026-01-05T07:00:00+00:00",
+                },
+                {
+                    "alarm_id": ALARM_ID,
+                    "event": "goes_off",
+                    "occurred_at": "2026-01-05T07:00:00+00:00",
+                },
+                {"event": "wakeup_stopped", "occurred_at": "2026-01-05T07:05:00+00:00"},
+            ],
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert [(data["alarm_id"], data["event"]) for data in fired] == [
+        (ALARM_ID, "goes_off"),
+        ("wakeup", "stopped"),
+    ]
+    coordinator = entry.runtime_data.coordinator
+    alarm = coordinator.get_alarm(ALARM_ID)
+    assert alarm is not None
+    assert alarm.last_event_goes_off_at is not None
+    phone = coordinator.get_phone()
+    assert phone is not None
+    assert phone.wakeup_last_event_stopped_at is not None
+    assert f"unknown alarm {STALE_ALARM_ID}" in caplog.text
+
+
+async def test_report_alarm_event_rejects_unknown_alarm(
+    hass: HomeAssistant, entry: MockConfigEntry
+) -> None:
+    with pytest.raises(ServiceValidationError, match=STALE_ALARM_ID):
+        await hass.services.async_call(
+            DOMAIN,
+            "report_alarm_event",
+            {"phone_id": "phone", "alarm_id": STALE_ALARM_ID, "event": "goes_off"},
+            blocking=True,
+        )
+
+
+async def test_report_events_fire_device_triggers(
+    hass: HomeAssistant, entry: MockConfigEntry
+) -> None:
+    triggered: list[tuple[str, str]] = []
+
+    def _record(event: Event) -> None:
+        triggered.append((event.event_type, event.data["device_id"]))
+
+    hass.bus.async_listen(f"{DOMAIN}_goes_off", _record)
+
+    for _ in range(2):
+        await hass.services.async_call(
+            DOMAIN,
+            "report_events",
+            {
+                "phone_id": "phone",
+                "events": [
+                    {"alarm_id": ALARM_ID, "event": "goes_off"},
+                    {"event": "wakeup_goes_off"},
+                ],
+            },
+            blocking=True,
+        )
+    await hass.async_block_till_done()
+
+    device_registry = dr.async_get(hass)
+    phone_device = device_registry.async_get_device(identifiers={(DOMAIN, "phone")})
+    alarm_device = device_registry.async_get_device(
+        identifiers={(DOMAIN, "phone", ALARM_ID)}
+    )
+    assert phone_device is not None
+    assert alarm_device is not None
+    assert triggered == 2 * [
+        (f"{DOMAIN}_goes_off", alarm_device.id),
+        (f"{DOMAIN}_goes_off", phone_device.id),
+    ]